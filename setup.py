@@ -9,6 +9,7 @@ setup(
         "numpy>=1.21.0",
         "opencv-python>=4.5.0",
         "pyautogui>=0.9.53",
+        "mss>=9.0.0",
         "pytesseract>=0.3.8",
         "Pillow>=8.0.0",
         "colorlog>=6.7.0",
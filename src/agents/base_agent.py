@@ -9,7 +9,7 @@ from typing import Any, Dict, Optional
 
 from utils.logger import get_logger
 from emulator.interface import EmulatorInterface
-from emulator.game_state import GameState
+from emulator.game_state import GameState, GameMode
 
 # Get logger for this module
 logger = get_logger("agents")
@@ -17,6 +17,9 @@ logger = get_logger("agents")
 class BaseAgent(ABC):
     """Base class for all agents."""
     
+    # Game mode this agent handles; None means any mode
+    target_mode: Optional[GameMode] = None
+    
     def __init__(self, name: str, emulator: EmulatorInterface):
         """Initialize the base agent.
         
@@ -26,8 +29,23 @@ class BaseAgent(ABC):
         """
         self.name = name
         self.emulator = emulator
+        
+        # Last state processed and its result, so a repeated state is not re-run
+        self._last_state: Optional[GameState] = None
+        self._last_result = False
         logger.info(f"Initialized {self.name} agent")
     
+    def can_handle(self, state: GameState) -> bool:
+        """Check if this agent can handle the current game state.
+        
+        Args:
+            state: Current game state
+            
+        Returns:
+            True if the agent can handle this state
+        """
+        return self.target_mode is None or state.mode == self.target_mode
+    
     @abstractmethod
     def analyze_state(self, state: GameState) -> Optional[Dict[str, Any]]:
         """Analyze the current game state and decide on an action.
@@ -61,27 +79,46 @@ class BaseAgent(ABC):
         Returns:
             True if agent took action
         """
+        # The same state object was already handled; don't act on it twice
+        if state is self._last_state:
+            return self._last_result
+            
         try:
             # Analyze state
             action_params = self.analyze_state(state)
             if action_params is None:
+                self._remember(state, False)
                 return False
             
             # Execute action
-            logger.debug(f"{self.name} executing action: {action_params}")
+            logger.debug("%s executing action: %s", self.name, action_params)
             success = self.execute_action(action_params)
             
             if success:
-                logger.debug(f"{self.name} successfully executed action")
+                logger.debug("%s successfully executed action", self.name)
             else:
-                logger.warning(f"{self.name} failed to execute action")
+                logger.warning("%s failed to execute action", self.name)
             
+            self._remember(state, success)
             return success
             
         except Exception as e:
             logger.error(f"Error in {self.name} update: {e}")
             return False
     
+    def _remember(self, state: GameState, result: bool) -> None:
+        """Record the outcome of processing a state.
+        
+        Holding the state itself (not its id) keeps the identity check valid,
+        since a live object's id can't be reused.
+        
+        Args:
+            state: State that was processed
+            result: Value update() returned for it
+        """
+        self._last_state = state
+        self._last_result = result
+    
     def handle_error(self, error: Exception) -> None:
         """Handle an error that occurred during agent operation.
         
@@ -4,27 +4,221 @@ Battle Agent Module
 This module contains the BattleAgent class for handling Pokemon battles.
 """
 
-import logging
-from typing import Dict, List, Optional, Tuple, Any
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple, Any
+
+import numpy as np
+
+from utils.logger import get_logger
 from .base_agent import BaseAgent
-from ..emulator.interface import GameState
-from src.emulator.interface import EmulatorInterface
-from src.emulator.game_state import GameMode
+from ._battle_kernels import best_move
+from emulator.interface import EmulatorInterface
+from emulator.game_state import GameState, GameMode, BattleState
+
+# Get logger for this module
+logger = get_logger("battle")
 
-# Configure logging
-logger = logging.getLogger("pokemon_player")
+# All Pokemon types, in type ID order
+TYPES = (
+    "NORMAL", "FIRE", "WATER", "ELECTRIC", "GRASS", "ICE",
+    "FIGHTING", "POISON", "GROUND", "FLYING", "PSYCHIC", "BUG",
+    "ROCK", "GHOST", "DRAGON", "DARK", "STEEL", "FAIRY",
+)
+TYPE_IDS = {name: i for i, name in enumerate(TYPES)}
 
-# Type effectiveness chart (simplified for example)
+# Type effectiveness chart: attacking type -> defending type -> multiplier.
+# Matchups not listed are neutral (1.0).
 TYPE_CHART = {
     "NORMAL": {"ROCK": 0.5, "GHOST": 0, "STEEL": 0.5},
     "FIRE": {"FIRE": 0.5, "WATER": 0.5, "GRASS": 2, "ICE": 2, "BUG": 2, "ROCK": 0.5, "DRAGON": 0.5, "STEEL": 2},
     "WATER": {"FIRE": 2, "WATER": 0.5, "GRASS": 0.5, "GROUND": 2, "ROCK": 2, "DRAGON": 0.5},
-    # Add more type matchups as needed
+    "ELECTRIC": {"WATER": 2, "ELECTRIC": 0.5, "GRASS": 0.5, "GROUND": 0, "FLYING": 2, "DRAGON": 0.5},
+    "GRASS": {"FIRE": 0.5, "WATER": 2, "GRASS": 0.5, "POISON": 0.5, "GROUND": 2, "FLYING": 0.5, "BUG": 0.5,
+              "ROCK": 2, "DRAGON": 0.5, "STEEL": 0.5},
+    "ICE": {"FIRE": 0.5, "WATER": 0.5, "GRASS": 2, "ICE": 0.5, "GROUND": 2, "FLYING": 2, "DRAGON": 2, "STEEL": 0.5},
+    "FIGHTING": {"NORMAL": 2, "ICE": 2, "POISON": 0.5, "FLYING": 0.5, "PSYCHIC": 0.5, "BUG": 0.5, "ROCK": 2,
+                 "GHOST": 0, "DARK": 2, "STEEL": 2, "FAIRY": 0.5},
+    "POISON": {"GRASS": 2, "POISON": 0.5, "GROUND": 0.5, "ROCK": 0.5, "GHOST": 0.5, "STEEL": 0, "FAIRY": 2},
+    "GROUND": {"FIRE": 2, "ELECTRIC": 2, "GRASS": 0.5, "POISON": 2, "FLYING": 0, "BUG": 0.5, "ROCK": 2, "STEEL": 2},
+    "FLYING": {"ELECTRIC": 0.5, "GRASS": 2, "FIGHTING": 2, "BUG": 2, "ROCK": 0.5, "STEEL": 0.5},
+    "PSYCHIC": {"FIGHTING": 2, "POISON": 2, "PSYCHIC": 0.5, "DARK": 0, "STEEL": 0.5},
+    "BUG": {"FIRE": 0.5, "GRASS": 2, "FIGHTING": 0.5, "POISON": 0.5, "FLYING": 0.5, "PSYCHIC": 2, "GHOST": 0.5,
+            "DARK": 2, "STEEL": 0.5, "FAIRY": 0.5},
+    "ROCK": {"FIRE": 2, "ICE": 2, "FIGHTING": 0.5, "GROUND": 0.5, "FLYING": 2, "BUG": 2, "STEEL": 0.5},
+    "GHOST": {"NORMAL": 0, "PSYCHIC": 2, "GHOST": 2, "DARK": 0.5},
+    "DRAGON": {"DRAGON": 2, "STEEL": 0.5, "FAIRY": 0},
+    "DARK": {"FIGHTING": 0.5, "PSYCHIC": 2, "GHOST": 2, "DARK": 0.5, "FAIRY": 0.5},
+    "STEEL": {"FIRE": 0.5, "WATER": 0.5, "ELECTRIC": 0.5, "ICE": 2, "ROCK": 2, "STEEL": 0.5, "FAIRY": 2},
+    "FAIRY": {"FIRE": 0.5, "FIGHTING": 2, "POISON": 0.5, "DRAGON": 2, "DARK": 2, "STEEL": 0.5},
 }
+# Read-only, since TYPE_CHART_NP is built from it once and wouldn't see edits
+TYPE_CHART = MappingProxyType({attacker: MappingProxyType(row) for attacker, row in TYPE_CHART.items()})
+
+def _build_type_matrix(chart: Dict[str, Dict[str, float]]) -> np.ndarray:
+    """Build a dense attacker x defender multiplier matrix from a chart.
+    
+    Args:
+        chart: Nested dict of attacking type -> defending type -> multiplier
+        
+    Returns:
+        float32 matrix indexed by [attacker_id, defender_id]
+    """
+    matrix = np.ones((len(TYPES), len(TYPES)), dtype=np.float32)
+    for attacker, row in chart.items():
+        for defender, multiplier in row.items():
+            matrix[TYPE_IDS[attacker], TYPE_IDS[defender]] = multiplier
+    return matrix
+
+# Type chart as a matrix, built once at import
+TYPE_CHART_NP = _build_type_matrix(TYPE_CHART)
+TYPE_CHART_NP.setflags(write=False)
+
+# Menu inputs, built once per slot: open the fight menu, move down to the
+# move and select it
+MOVE_SEQUENCES = tuple(("A",) + ("DOWN",) * i + ("A",) for i in range(4))
+
+# Exit the current menu, open the Pokemon menu, pick the target and confirm
+SWITCH_SEQUENCES = tuple(("B", "RIGHT", "A") + ("DOWN",) * i + ("A", "A") for i in range(6))
+
+@lru_cache(maxsize=None)
+def _type_ids(types: Tuple[str, ...]) -> np.ndarray:
+    """Convert type names to type IDs, skipping unknown types.
+    
+    Args:
+        types: Tuple of type names
+        
+    Returns:
+        Array of type IDs
+    """
+    return np.array([TYPE_IDS[t] for t in types if t in TYPE_IDS], dtype=np.intp)
+
+@dataclass
+class Move:
+    """A battle move, parsed once from the raw move dict."""
+    __slots__ = ("name", "power", "type_id", "pp", "category", "accuracy")
+    
+    name: Optional[str]
+    power: int
+    type_id: int
+    pp: int
+    category: str
+    accuracy: float
+    
+    @classmethod
+    def from_dict(cls, move: Dict[str, Any]) -> "Move":
+        """Parse a raw move dict.
+        
+        Args:
+            move: Move data with at least "power" and "type"
+            
+        Returns:
+            Move: The parsed move
+        """
+        return cls(
+            name=move.get("name"),
+            power=move["power"],
+            # Unknown move types get -1 and score as neutral
+            type_id=TYPE_IDS.get(move["type"], -1),
+            pp=move.get("pp", 1),
+            category=move.get("category", "PHYSICAL"),
+            accuracy=move.get("accuracy", 100) / 100.0
+        )
+
+@dataclass
+class BattleSnapshot:
+    """Per-turn battle data, with moves stored as parallel arrays."""
+    __slots__ = ("active_hp_pct", "active_type_ids", "opp_type_ids", "moves", "move_powers", "move_type_ids", "move_pp", "move_accuracy")
+    
+    active_hp_pct: float
+    active_type_ids: np.ndarray
+    opp_type_ids: np.ndarray
+    moves: List[Move]
+    move_powers: np.ndarray
+    move_type_ids: np.ndarray
+    move_pp: np.ndarray
+    move_accuracy: np.ndarray
+    
+    @classmethod
+    def from_battle(cls, battle: BattleState) -> "BattleSnapshot":
+        """Build a snapshot in one pass over the battle state.
+        
+        Args:
+            battle: The current battle state
+            
+        Returns:
+            BattleSnapshot: The snapshot for this turn
+        """
+        active = battle.player_pokemon or {}
+        opponent = battle.opponent_pokemon or {}
+        raw_moves = battle.available_moves or []
+        moves = [Move.from_dict(move) for move in raw_moves]
+        
+        powers = np.empty(len(moves), dtype=np.float32)
+        type_ids = np.empty(len(moves), dtype=np.intp)
+        pp = np.empty(len(moves), dtype=np.int16)
+        accuracy = np.empty(len(moves), dtype=np.float32)
+        for i, move in enumerate(moves):
+            powers[i] = move.power
+            type_ids[i] = move.type_id
+            pp[i] = move.pp
+            accuracy[i] = move.accuracy
+            
+        return cls(
+            active_hp_pct=active.get("hp_percent", 100),
+            active_type_ids=_type_ids(tuple(active.get("type", ()))),
+            opp_type_ids=_type_ids(tuple(opponent.get("type", ()))),
+            moves=moves,
+            move_powers=powers,
+            move_type_ids=type_ids,
+            move_pp=pp,
+            move_accuracy=accuracy
+        )
+    
+    def refresh(self, battle: BattleState) -> None:
+        """Update the per-turn fields (HP and PP) in place.
+        
+        Only valid while the Pokemon and move set are the ones the snapshot
+        was built from.
+        
+        Args:
+            battle: The current battle state
+        """
+        active = battle.player_pokemon or {}
+        self.active_hp_pct = active.get("hp_percent", 100)
+        for i, (move, raw) in enumerate(zip(self.moves, battle.available_moves or [])):
+            move.pp = self.move_pp[i] = raw.get("pp", 1)
+
+def _battle_identity(battle: BattleState) -> Optional[Tuple]:
+    """Get what identifies a matchup: both Pokemon and the move set.
+    
+    Args:
+        battle: The current battle state
+        
+    Returns:
+        Identity tuple, or None if something is unnamed and can't be compared
+    """
+    active = battle.player_pokemon or {}
+    opponent = battle.opponent_pokemon or {}
+    names = tuple(move.get("name") for move in battle.available_moves or [])
+    identity = (active.get("species"), opponent.get("species"), names)
+    if identity[0] is None or identity[1] is None or None in names:
+        return None
+    return identity
 
 class BattleAgent(BaseAgent):
     """Agent responsible for handling Pokemon battles."""
     
+    target_mode = GameMode.BATTLE
+    
+    # Most decisions remembered per agent, evicting the least recently used
+    DECISION_CACHE_SIZE = 128
+    
+    # Switch out below this HP percentage, if a party member is above it
+    SWITCH_HP_PCT = 20
+    
     def __init__(self, name: str, emulator: EmulatorInterface):
         """Initialize the battle agent.
         
@@ -34,8 +228,23 @@ class BattleAgent(BaseAgent):
         """
         super().__init__(name, emulator)
         self.strategy = "AGGRESSIVE"
-        self.current_battle = None
+        self.current_battle: Optional[BattleSnapshot] = None
         self.logger = logger
+        
+        # Matchup the current snapshot was built for, see _battle_identity
+        self._battle_id: Optional[Tuple] = None
+        
+        # Decisions keyed on everything they depend on, see analyze_state
+        self._decision_cache: "OrderedDict[Tuple, Optional[Mapping[str, Any]]]" = OrderedDict()
+        
+        # Whether the party has anyone worth switching to, see analyze_state
+        self._can_switch = True
+        
+        # Action name -> (handler, key of the handler's argument in the action)
+        self._action_handlers = {
+            "move": (self._execute_move, "move_index"),
+            "switch": (self._execute_switch, "target")
+        }
         logger.info(f"Battle Agent initialized with strategy: {self.strategy}")
     
     def can_handle(self, state: GameState) -> bool:
@@ -49,34 +258,62 @@ class BattleAgent(BaseAgent):
         """
         return state.is_in_battle()
     
-    def analyze_state(self, state: GameState) -> Optional[Dict[str, Any]]:
+    def analyze_state(self, state: GameState) -> Optional[Mapping[str, Any]]:
         """Analyze the current battle state and decide on an action.
         
+        Actions are read-only and shared with the decision cache, so repeated
+        decisions allocate nothing.
+        
         Args:
             state: The current game state
             
         Returns:
-            Optional[Dict[str, Any]]: The action to take, or None if no valid action
+            Optional[Mapping[str, Any]]: The action to take, or None if no valid action
         """
         if not state.battle:
             return None
 
-        self.current_battle = {
-            "active_pokemon": state.battle.player_pokemon,
-            "opponent_pokemon": state.battle.opponent_pokemon,
-            "available_moves": state.battle.available_moves
-        }
+        self._update_snapshot(state.battle)
+        
+        # Without party data, assume a switch target exists
+        player = state.player
+        self._can_switch = not (player and player.party) or player.has_healthy_pokemon(self.SWITCH_HP_PCT)
+
+        # The decision only depends on the matchup, HP, PP and whether a
+        # switch is possible; reuse it when those repeat. Unnamed matchups
+        # can't be keyed safely.
+        key = None
+        if self._battle_id is not None:
+            key = (self._battle_id, self.current_battle.active_hp_pct, self.current_battle.move_pp.tobytes(),
+                   self._can_switch)
+            if key in self._decision_cache:
+                self._decision_cache.move_to_end(key)
+                return self._decision_cache[key]
 
+        action = self._decide()
+        
+        if key is not None:
+            self._decision_cache[key] = action
+            if len(self._decision_cache) > self.DECISION_CACHE_SIZE:
+                self._decision_cache.popitem(last=False)
+        return action
+    
+    def _decide(self) -> Optional[Mapping[str, Any]]:
+        """Choose an action for the current snapshot.
+        
+        Returns:
+            Optional[Mapping[str, Any]]: The read-only action to take, or None if no valid action
+        """
         if self._should_switch():
-            return {"action": "switch", "target": self._get_best_switch_target()}
+            return MappingProxyType({"action": "switch", "target": self._get_best_switch_target()})
 
         move_index = self._get_best_move()
         if move_index is not None:
-            return {"action": "move", "move_index": move_index}
+            return MappingProxyType({"action": "move", "move_index": move_index})
 
         return None
     
-    def execute_action(self, action: Dict[str, Any]) -> bool:
+    def execute_action(self, action: Mapping[str, Any]) -> bool:
         """Execute the chosen battle action.
         
         Args:
@@ -86,52 +323,47 @@ class BattleAgent(BaseAgent):
             bool: True if action was executed successfully
         """
         try:
-            if action["action"] == "move":
-                self._execute_move(action["move_index"])
-            elif action["action"] == "switch":
-                self._execute_switch(action["target"])
+            entry = self._action_handlers.get(action["action"])
+            if entry is None:
+                self.logger.error(f"Unknown battle action: {action['action']}")
+                return False
+                
+            handler, arg_key = entry
+            handler(action[arg_key])
             return True
         except Exception as e:
             self.logger.error(f"Error executing battle action: {e}")
             return False
         
-    def _calculate_move_score(self, move: Dict[str, Any]) -> float:
-        """Calculate a score for a given move.
+    def _update_snapshot(self, battle: BattleState) -> None:
+        """Refresh the battle snapshot, rebuilding it only when the matchup changes.
         
         Args:
-            move: The move to score
-            
-        Returns:
-            float: The calculated score
+            battle: The current battle state
         """
-        base_score = move["power"]
-        
-        # Type effectiveness multiplier
-        multiplier = self._get_type_effectiveness(
-            move["type"], 
-            self.current_battle["opponent_pokemon"]["type"]
-        )
-        
-        return base_score * multiplier
+        battle_id = _battle_identity(battle)
+        if self.current_battle is not None and battle_id is not None and battle_id == self._battle_id:
+            self.current_battle.refresh(battle)
+            return
+            
+        self.current_battle = BattleSnapshot.from_battle(battle)
+        self._battle_id = battle_id
     
     def _get_best_move(self) -> Optional[int]:
         """Get the index of the best available move.
         
         Returns:
-            Optional[int]: Index of the best move, or None if no moves available
+            Optional[int]: Index of the best move, or None if no move has PP left
         """
-        if not self.current_battle["available_moves"]:
-            return None
-
-        move_scores = [
-            (i, self._calculate_move_score(move))
-            for i, move in enumerate(self.current_battle["available_moves"])
-        ]
-        
-        if not move_scores:
+        snapshot = self.current_battle
+        if snapshot is None or snapshot.move_powers.size == 0:
             return None
             
-        return max(move_scores, key=lambda x: x[1])[0]
+        best = best_move(
+            snapshot.move_powers, snapshot.move_pp, snapshot.move_type_ids, snapshot.move_accuracy,
+            snapshot.active_type_ids, snapshot.opp_type_ids, TYPE_CHART_NP
+        )
+        return int(best) if best >= 0 else None
     
     def _should_switch(self) -> bool:
         """Determine if we should switch Pokemon.
@@ -139,11 +371,10 @@ class BattleAgent(BaseAgent):
         Returns:
             bool: True if we should switch
         """
-        if not self.current_battle:
+        if not self.current_battle or not self._can_switch:
             return False
             
-        hp_percent = self.current_battle["active_pokemon"]["hp_percent"]
-        return hp_percent < 20  # Switch if HP is below 20%
+        return self.current_battle.active_hp_pct < self.SWITCH_HP_PCT
     
     def _get_best_switch_target(self) -> Optional[int]:
         """Get the best Pokemon to switch to.
@@ -160,13 +391,7 @@ class BattleAgent(BaseAgent):
         Args:
             move_index: Index of the move to use
         """
-        # Navigate to move
-        self.emulator.press_button("A")  # Enter fight menu
-        
-        # Select move
-        for _ in range(move_index):
-            self.emulator.press_button("DOWN")
-        self.emulator.press_button("A")
+        self.emulator.press_sequence(MOVE_SEQUENCES[move_index])
 
     def _execute_switch(self, target_index: int) -> None:
         """Execute a Pokemon switch.
@@ -174,16 +399,7 @@ class BattleAgent(BaseAgent):
         Args:
             target_index: Index of the Pokemon to switch to
         """
-        # Navigate to Pokemon menu
-        self.emulator.press_button("B")  # Exit current menu if in one
-        self.emulator.press_button("RIGHT")  # Go to Pokemon menu
-        self.emulator.press_button("A")  # Enter Pokemon menu
-        
-        # Select target Pokemon
-        for _ in range(target_index):
-            self.emulator.press_button("DOWN")
-        self.emulator.press_button("A")  # Select Pokemon
-        self.emulator.press_button("A")  # Confirm switch
+        self.emulator.press_sequence(SWITCH_SEQUENCES[target_index])
 
     def _get_type_effectiveness(self, move_type: str, defender_types: list) -> float:
         """Calculate type effectiveness multiplier.
@@ -195,29 +411,11 @@ class BattleAgent(BaseAgent):
         Returns:
             float: The type effectiveness multiplier
         """
-        # TODO: Implement full type chart
-        type_chart = {
-            "FIRE": {
-                "GRASS": 2.0,
-                "WATER": 0.5
-            },
-            "WATER": {
-                "FIRE": 2.0,
-                "GRASS": 0.5
-            },
-            "GRASS": {
-                "WATER": 2.0,
-                "FIRE": 0.5
-            }
-        }
+        move_id = TYPE_IDS.get(move_type)
         
         # Default to neutral effectiveness
-        if move_type not in type_chart:
+        if move_id is None:
             return 1.0
             
-        multiplier = 1.0
-        for def_type in defender_types:
-            if def_type in type_chart[move_type]:
-                multiplier *= type_chart[move_type][def_type]
-                
-        return multiplier 
\ No newline at end of file
+        defender_ids = _type_ids(tuple(defender_types))
+        return float(TYPE_CHART_NP[move_id, defender_ids].prod())
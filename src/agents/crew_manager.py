@@ -17,7 +17,7 @@ from .battle_agent import BattleAgent
 # Get logger for this module
 logger = get_logger("agents")
 
-@dataclass
+@dataclass(frozen=True)
 class AgentPriority:
     """Priority configuration for different game modes."""
     battle: int = 100
@@ -38,9 +38,21 @@ class CrewManager:
         self.emulator = emulator
         self.state_manager = state_manager
         self.agents: Dict[str, BaseAgent] = {}
+        
+        # Candidate agents per game mode, highest priority first
+        self._by_mode: Dict[GameMode, List[BaseAgent]] = {}
         self.priorities = AgentPriority()
+        self._prio_map: Dict[GameMode, int] = {
+            GameMode.BATTLE: self.priorities.battle,
+            GameMode.DIALOG: self.priorities.dialog,
+            GameMode.MENU: self.priorities.menu,
+            GameMode.OVERWORLD: self.priorities.navigation
+        }
         self.active_agent = None
-        self.last_state = None
+        
+        # Last state seen and its comparison key, kept in sync by the last_state setter
+        self._last_state: Optional[GameState] = None
+        self._last_state_key: Optional[tuple] = None
         
         # Initialize default agents
         self._init_default_agents()
@@ -53,15 +65,16 @@ class CrewManager:
         self.register_agent("battle", battle_agent)
     
     def register_agent(self, name: str, agent: BaseAgent) -> None:
-        """Register an agent.
+        """Register an agent, replacing any agent already registered under the name.
         
         Args:
             name: Agent name/identifier
             agent: Agent instance
         """
-        if name not in self.agents:
+        if self.agents.get(name) is not agent:
             self.agents[name] = agent
-            logger.info(f"Registered agent: {name}")
+            self._rebuild_dispatch()
+            logger.info("Registered agent: %s", name)
     
     def unregister_agent(self, name: str) -> None:
         """Unregister an agent.
@@ -71,7 +84,25 @@ class CrewManager:
         """
         if name in self.agents:
             del self.agents[name]
-            logger.info(f"Unregistered agent: {name}")
+            self._rebuild_dispatch()
+            logger.info("Unregistered agent: %s", name)
+    
+    def _rebuild_dispatch(self) -> None:
+        """Rebuild the mode -> agents table after the agent set changes.
+        
+        Agents bound to a mode come first, ordered by that mode's priority;
+        agents without a target mode are tried last for every mode.
+        """
+        by_mode: Dict[GameMode, List[BaseAgent]] = {mode: [] for mode in GameMode}
+        ranked = sorted(
+            self.agents.values(),
+            key=lambda agent: (agent.target_mode is None, -self._get_priority_for_mode(agent.target_mode))
+        )
+        for agent in ranked:
+            modes = GameMode if agent.target_mode is None else (agent.target_mode,)
+            for mode in modes:
+                by_mode[mode].append(agent)
+        self._by_mode = by_mode
     
     def get_appropriate_agent(self, state: GameState) -> Optional[BaseAgent]:
         """Get the most appropriate agent for the current state.
@@ -82,11 +113,8 @@ class CrewManager:
         Returns:
             Most appropriate agent or None
         """
-        # Check each agent in priority order
-        for agent_name, agent in sorted(
-            self.agents.items(),
-            key=lambda x: self._get_priority_for_mode(state.mode)
-        ):
+        # Check the agents for this mode in priority order
+        for agent in self._by_mode.get(state.mode, ()):
             if agent.can_handle(state):
                 return agent
         return None
@@ -101,23 +129,44 @@ class CrewManager:
             # Get current state
             state = self.state_manager.current_state
             
-            # Check for state change
-            if not self._state_changed(state):
-                return False
+            # Agent selection only changes with the state; otherwise reuse it
+            if self._state_changed(state):
+                self.active_agent = self.get_appropriate_agent(state)
                 
-            # Get appropriate agent
-            agent = self.get_appropriate_agent(state)
-            if not agent:
+            if not self.active_agent:
                 return False
                 
             # Update agent
-            self.active_agent = agent
-            return agent.update(state)
+            return self.active_agent.update(state)
             
         except Exception as e:
             logger.error(f"Error in crew manager update: {e}")
             return False
     
+    @property
+    def last_state(self) -> Optional[GameState]:
+        """Last game state that counted as a change."""
+        return self._last_state
+    
+    @last_state.setter
+    def last_state(self, state: Optional[GameState]) -> None:
+        self._last_state = state
+        self._last_state_key = None if state is None else self._state_key(state)
+    
+    @staticmethod
+    def _state_key(state: GameState) -> tuple:
+        """Get the fields that decide whether the state changed significantly.
+        
+        Battle status follows from the mode, so it needs no separate entry.
+        
+        Args:
+            state: Game state
+            
+        Returns:
+            Comparison key
+        """
+        return (state.mode, state.location)
+    
     def _state_changed(self, state: GameState) -> bool:
         """Check if game state has changed significantly.
         
@@ -127,23 +176,15 @@ class CrewManager:
         Returns:
             True if state has changed
         """
-        if not self.last_state:
-            self.last_state = state
-            return True
-            
-        # Check for mode change
-        if state.mode != self.last_state.mode:
-            self.last_state = state
-            return True
-            
-        # Check for battle state change
-        if state.is_in_battle() != self.last_state.is_in_battle():
-            self.last_state = state
-            return True
+        key = self._state_key(state)
+        if self._last_state is not None and key == self._last_state_key:
+            return False
             
-        return False
+        self._last_state = state
+        self._last_state_key = key
+        return True
     
-    def _get_priority_for_mode(self, mode: GameMode) -> int:
+    def _get_priority_for_mode(self, mode: Optional[GameMode]) -> int:
         """Get priority value for a game mode.
         
         Args:
@@ -152,13 +193,7 @@ class CrewManager:
         Returns:
             Priority value
         """
-        if mode == GameMode.BATTLE:
-            return self.priorities.battle
-        elif mode == GameMode.DIALOG:
-            return self.priorities.dialog
-        elif mode == GameMode.MENU:
-            return self.priorities.menu
-        return 0
+        return self._prio_map.get(mode, 0)
     
     def get_status(self) -> Dict[str, Any]:
         """Get current status of the crew.
@@ -176,4 +211,5 @@ class CrewManager:
         """Clean up resources."""
         self.active_agent = None
         self.agents.clear()
+        self._by_mode.clear()
         logger.info("Crew manager shut down") 
\ No newline at end of file
@@ -0,0 +1,196 @@
+"""
+Pathfinding Kernels
+
+Compiled with numba when it is installed. Without numba, GridPathFinder
+keeps its pure Python search, which is faster than running these
+array-based loops uncompiled.
+"""
+
+import numpy as np
+
+# Largest grid whose packed heap keys (see astar_grid) fit in an int64
+MAX_GRID_CELLS = 1 << 20
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback that leaves the function uncompiled."""
+        def decorator(func):
+            return func
+        return decorator
+
+@njit(cache=True)
+def _heap_push(heap: np.ndarray, size: int, key: int) -> int:
+    """Push a key onto a binary min-heap stored in heap[:size].
+    
+    Args:
+        heap: Preallocated heap storage
+        size: Current number of keys
+        key: Key to push
+        
+    Returns:
+        New number of keys
+    """
+    i = size
+    while i > 0:
+        parent = (i - 1) >> 1
+        if heap[parent] <= key:
+            break
+        heap[i] = heap[parent]
+        i = parent
+    heap[i] = key
+    return size + 1
+
+@njit(cache=True)
+def _heap_pop(heap: np.ndarray, size: int) -> int:
+    """Remove the smallest key from a binary min-heap stored in heap[:size].
+    
+    The caller is responsible for decrementing its size.
+    
+    Args:
+        heap: Heap storage
+        size: Current number of keys, at least 1
+        
+    Returns:
+        The smallest key
+    """
+    top = heap[0]
+    size -= 1
+    key = heap[size]
+    i = 0
+    while True:
+        child = 2 * i + 1
+        if child >= size:
+            break
+        if child + 1 < size and heap[child + 1] < heap[child]:
+            child += 1
+        if key <= heap[child]:
+            break
+        heap[i] = heap[child]
+        i = child
+    heap[i] = key
+    return top
+
+@njit(cache=True)
+def _estimate(landmarks: np.ndarray, index: int, goal: int, manhattan: int) -> int:
+    """Lower-bound the distance from a cell to the goal.
+    
+    Takes the larger of the Manhattan distance and the landmark (ALT)
+    bound |d(cell, L) - d(goal, L)| over every landmark L reaching both.
+    
+    Args:
+        landmarks: Landmark x cell grid distances, -1 where unreachable
+        index: Flat index of the cell
+        goal: Flat index of the goal
+        manhattan: Manhattan distance from the cell to the goal
+        
+    Returns:
+        Admissible distance estimate
+    """
+    h = manhattan
+    for landmark in range(landmarks.shape[0]):
+        a = landmarks[landmark, index]
+        b = landmarks[landmark, goal]
+        if a >= 0 and b >= 0:
+            bound = abs(a - b)
+            if bound > h:
+                h = bound
+    return h
+
+@njit(cache=True)
+def astar_grid(walkable: np.ndarray, width: int, height: int, start: int, goal: int,
+               landmarks: np.ndarray) -> np.ndarray:
+    """Run A* over a flattened 4-connected grid.
+    
+    Expands cells in the same order as GridPathFinder.find_path, so both
+    return the same path. Grids must have at most MAX_GRID_CELLS cells.
+    
+    Args:
+        walkable: Flat uint8 array, nonzero where a cell can be entered
+        width: Grid width
+        height: Grid height
+        start: Flat index of the starting cell
+        goal: Flat index of the target cell
+        landmarks: Landmark x cell grid distances for the ALT heuristic,
+            -1 where unreachable; may have no rows
+        
+    Returns:
+        Flat array of each cell's predecessor, -1 where there is none; the
+        goal is unreached if it is not the start and has no predecessor
+    """
+    size = width * height
+    came_from = np.full(size, -1, np.int64)
+    g_score = np.full(size, size, np.int64)  # No path is longer than the cell count
+    closed = np.zeros(size, np.bool_)
+    g_score[start] = 0
+    
+    goal_y = goal // width
+    goal_x = goal - goal_y * width
+    start_y = start // width
+    start_x = start - start_y * width
+    
+    # Frontier keys pack (f, size - g, index) into one int, so f ties go to
+    # the cell furthest along. Each expansion pushes at most 4 keys.
+    span = size + 1
+    frontier = np.empty(4 * size + 1, np.int64)
+    h = _estimate(landmarks, start, goal, abs(start_x - goal_x) + abs(start_y - goal_y))
+    count = _heap_push(frontier, 0, (h * span + size) * size + start)
+    while count > 0:
+        index = _heap_pop(frontier, count) % size
+        count -= 1
+        if index == goal:
+            break
+        if closed[index]:
+            continue
+        closed[index] = True
+        
+        y = index // width
+        x = index - y * width
+        tentative_g = g_score[index] + 1
+        # Same step order as GridPathFinder.STEPS: right, left, down, up
+        for step in range(4):
+            nx = x + (1 if step == 0 else -1 if step == 1 else 0)
+            ny = y + (1 if step == 2 else -1 if step == 3 else 0)
+            if nx < 0 or nx >= width or ny < 0 or ny >= height:
+                continue
+            neighbor = ny * width + nx
+            # Expanded cells already have their shortest g (consistent heuristic)
+            if walkable[neighbor] and tentative_g < g_score[neighbor]:
+                came_from[neighbor] = index
+                g_score[neighbor] = tentative_g
+                f = tentative_g + _estimate(landmarks, neighbor, goal, abs(nx - goal_x) + abs(ny - goal_y))
+                count = _heap_push(frontier, count, (f * span + size - tentative_g) * size + neighbor)
+    return came_from
+
+@njit(cache=True)
+def trace_path(came_from: np.ndarray, goal: int) -> np.ndarray:
+    """Follow predecessors back from the goal into a path array.
+    
+    Args:
+        came_from: Flat predecessor array from astar_grid
+        goal: Flat index of the target cell
+        
+    Returns:
+        Flat cell indices from start to goal
+    """
+    length = 1
+    index = goal
+    while came_from[index] != -1:
+        index = came_from[index]
+        length += 1
+        
+    path = np.empty(length, np.int64)
+    index = goal
+    for i in range(length - 1, -1, -1):
+        path[i] = index
+        index = came_from[index]
+    return path
+
+# Compile up front so the first path query doesn't pay for it
+if NUMBA_AVAILABLE:
+    astar_grid(np.ones(1, dtype=np.uint8), 1, 1, 0, 0, np.zeros((1, 1), dtype=np.int32))
+    trace_path(np.full(1, -1, np.int64), 0)
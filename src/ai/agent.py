@@ -2,12 +2,17 @@
 Base agent class for Pokemon game automation
 """
 
+from enum import Enum, auto
 from typing import List, Dict, Any, Optional
 from utils.command_queue import CommandQueue, GameCommand
 from utils.logger import get_logger
 
 logger = get_logger("pokemon_player")
 
+class AgentAction(Enum):
+    """Actions an agent can decide on."""
+    MOVE = auto()  # Move the player in the overworld
+
 class Agent:
     """Base class for specialized agents"""
     
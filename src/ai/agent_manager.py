@@ -4,21 +4,30 @@ Agent Manager Module
 This module manages AI agents and their interactions with the game.
 """
 
-from typing import Dict, List, Optional, Type
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
 from dataclasses import dataclass, field
 
 from utils.logger import get_logger
-from utils.config_manager import AIConfig
 from emulator.interface import EmulatorInterface
 from emulator.game_state import GameState, GameMode
-from .agent import Agent, AgentAction
-from .battle_agent import BattleAgent, BattleStrategy
+from agents.base_agent import BaseAgent
+from agents.battle_agent import BattleAgent
+from .agent import Agent
 from .navigation_agent import NavigationAgent, NavigationMode
 
 # Get logger for this module
 logger = get_logger("ai")
 
-@dataclass
+# Battle strategies accepted in the config
+BATTLE_STRATEGIES = ("AGGRESSIVE", "DEFENSIVE", "BALANCED")
+
+# Agents the manager drives: ai Agents that decide with
+# analyze_state(state) and act with execute_action(action, state), or
+# BaseAgents whose execute_action(action) takes no state
+ManagedAgent = Union[Agent, BaseAgent]
+
+@dataclass(frozen=True)
 class AgentPriority:
     """Priority configuration for different game modes."""
     battle: int = 100
@@ -29,10 +38,9 @@ class AgentPriority:
 @dataclass
 class AIConfig:
     """Configuration for AI behavior."""
-    battle_strategy: BattleStrategy = BattleStrategy.BALANCED
+    battle_strategy: str = "AGGRESSIVE"
     navigation_mode: NavigationMode = NavigationMode.EXPLORE
-    switch_threshold: float = 0.3
-    status_move_weight: float = 0.4
+    switch_threshold: float = 0.2  # Fraction of max HP below which to switch out
 
 @dataclass
 class AgentManager:
@@ -41,14 +49,18 @@ class AgentManager:
     emulator: EmulatorInterface
     config: Dict = field(default_factory=dict)
     
+    # Longest an agent's analysis may take before its answer is ignored, in seconds
+    ANALYZE_TIMEOUT = 5.0
+    
     def __post_init__(self):
         """Initialize agents after dataclass initialization."""
         # Parse configuration
         ai_config = AIConfig()
         if "battle_strategy" in self.config:
-            try:
-                ai_config.battle_strategy = BattleStrategy[self.config["battle_strategy"].upper()]
-            except KeyError:
+            strategy = self.config["battle_strategy"].upper()
+            if strategy in BATTLE_STRATEGIES:
+                ai_config.battle_strategy = strategy
+            else:
                 logger.warning(f"Invalid battle strategy: {self.config['battle_strategy']}")
         
         if "navigation_mode" in self.config:
@@ -57,17 +69,12 @@ class AgentManager:
             except KeyError:
                 logger.warning(f"Invalid navigation mode: {self.config['navigation_mode']}")
         
-        ai_config.switch_threshold = self.config.get("switch_threshold", 0.3)
-        ai_config.status_move_weight = self.config.get("status_move_weight", 0.4)
+        ai_config.switch_threshold = self.config.get("switch_threshold", ai_config.switch_threshold)
         
         # Initialize agents
-        self.battle_agent = BattleAgent(
-            name="BattleAgent",
-            emulator=self.emulator,
-            strategy=ai_config.battle_strategy,
-            switch_threshold=ai_config.switch_threshold,
-            status_move_weight=ai_config.status_move_weight
-        )
+        self.battle_agent = BattleAgent(name="BattleAgent", emulator=self.emulator)
+        self.battle_agent.strategy = ai_config.battle_strategy
+        self.battle_agent.SWITCH_HP_PCT = ai_config.switch_threshold * 100
         
         self.navigation_agent = NavigationAgent(
             name="NavigationAgent",
@@ -75,6 +82,21 @@ class AgentManager:
             mode=ai_config.navigation_mode
         )
         
+        # Agents per game mode, highest priority first, plus their
+        # priorities and an exact-type index for get_agent
+        self.mode_agents: Dict[GameMode, List[ManagedAgent]] = {mode: [] for mode in GameMode}
+        self._priorities: Dict[Tuple[GameMode, ManagedAgent], int] = {}
+        self._by_type: Dict[Type[ManagedAgent], ManagedAgent] = {}
+        priorities = AgentPriority()
+        self.register_agent(GameMode.BATTLE, self.battle_agent, priorities.battle)
+        self.register_agent(GameMode.OVERWORLD, self.navigation_agent, priorities.navigation)
+        
+        # Shared workers so several agents' (often LLM-bound) analyses overlap
+        self._pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="agent")
+        
+        # Analyses that outlived ANALYZE_TIMEOUT; their agents sit out until they finish
+        self._in_flight: Dict[ManagedAgent, Future] = {}
+        
         logger.info("Initialized AgentManager")
     
     def update(self, state: GameState) -> bool:
@@ -87,45 +109,110 @@ class AgentManager:
             True if any agent took action
         """
         try:
-            # Select appropriate agent based on game mode
-            if state.mode == GameMode.BATTLE:
-                return self.battle_agent.update(state)
-            elif state.mode == GameMode.OVERWORLD:
-                return self.navigation_agent.update(state)
-            else:
-                logger.debug(f"No agent available for mode: {state.mode}")
+            agents = self.mode_agents[state.mode]
+            if not agents:
+                logger.debug("No agent available for mode: %s", state.mode)
                 return False
+                
+            if len(agents) == 1 and not self._in_flight:
+                agent = agents[0]
+                action = agent.analyze_state(state)
+                return action is not None and self._execute(agent, action, state)
+                
+            # Analyze in parallel. An agent whose last analysis is still
+            # running sits out, so no agent is ever analyzed twice at once.
+            futures: Dict[ManagedAgent, Future] = {}
+            for agent in agents:
+                pending = self._in_flight.get(agent)
+                if pending is not None:
+                    if not pending.done():
+                        logger.debug("%s still analyzing, skipped", agent.name)
+                        continue
+                    del self._in_flight[agent]  # Its late result is stale
+                futures[agent] = self._pool.submit(agent.analyze_state, state)
+                
+            # One deadline for the whole batch
+            done, _ = wait(futures.values(), timeout=self.ANALYZE_TIMEOUT)
+            
+            # Agents are in priority order, so the first with an action acts
+            chosen = None
+            for agent, future in futures.items():
+                if future not in done:
+                    logger.warning("%s analysis timed out", agent.name)
+                    self._in_flight[agent] = future
+                elif chosen is None:
+                    try:
+                        action = future.result()
+                    except Exception as e:
+                        logger.error("Error in %s analysis: %s", agent.name, e)
+                        continue
+                    if action is not None:
+                        chosen = (agent, action)
+                        
+            return chosen is not None and self._execute(chosen[0], chosen[1], state)
             
         except Exception as e:
             logger.error(f"Error in agent update: {e}")
             return False
     
-    def register_agent(self, mode: GameMode, agent: Agent) -> None:
+    @staticmethod
+    def _execute(agent: ManagedAgent, action: Any, state: GameState) -> bool:
+        """Execute an agent's action.
+        
+        Args:
+            agent: Agent that chose the action
+            action: Action returned by its analyze_state
+            state: Game state the action was chosen for
+            
+        Returns:
+            True if the action was executed successfully
+        """
+        if isinstance(agent, BaseAgent):
+            return agent.execute_action(action)
+        return agent.execute_action(action, state)
+    
+    def register_agent(self, mode: GameMode, agent: ManagedAgent, priority: int = 0) -> None:
         """Register a new agent for a game mode.
         
         Args:
             mode: Game mode to register for
             agent: Agent to register
+            priority: Higher priority agents act first when several have
+                an action; ties go to the earlier registration
         """
-        if mode not in self.mode_agents:
-            self.mode_agents[mode] = []
-        
-        if agent not in self.mode_agents[mode]:
-            self.mode_agents[mode].append(agent)
-            logger.info(f"Registered {agent.name} for {mode}")
+        agents = self.mode_agents[mode]
+        if agent not in agents:
+            self._priorities[mode, agent] = priority
+            agents.append(agent)
+            agents.sort(key=lambda other: -self._priorities[mode, other])
+            self._by_type.setdefault(type(agent), agent)
+            logger.info("Registered %s for %s", agent.name, mode)
     
-    def unregister_agent(self, mode: GameMode, agent: Agent) -> None:
+    def unregister_agent(self, mode: GameMode, agent: ManagedAgent) -> None:
         """Unregister an agent from a game mode.
         
         Args:
             mode: Game mode to unregister from
             agent: Agent to unregister
         """
-        if mode in self.mode_agents and agent in self.mode_agents[mode]:
-            self.mode_agents[mode].remove(agent)
-            logger.info(f"Unregistered {agent.name} from {mode}")
+        agents = self.mode_agents[mode]
+        if agent in agents:
+            agents.remove(agent)
+            del self._priorities[mode, agent]
+            if self._by_type.get(type(agent)) is agent:
+                # Point the index at another registered agent of the same type, if any
+                replacement = next(
+                    (other for agents in self.mode_agents.values() for other in agents
+                     if type(other) is type(agent)),
+                    None
+                )
+                if replacement is None:
+                    del self._by_type[type(agent)]
+                else:
+                    self._by_type[type(agent)] = replacement
+            logger.info("Unregistered %s from %s", agent.name, mode)
     
-    def get_agent(self, agent_type: Type[Agent]) -> Optional[Agent]:
+    def get_agent(self, agent_type: Type[ManagedAgent]) -> Optional[ManagedAgent]:
         """Get an agent of the specified type.
         
         Args:
@@ -134,6 +221,11 @@ class AgentManager:
         Returns:
             Agent instance if found, None otherwise
         """
+        agent = self._by_type.get(agent_type)
+        if agent is not None:
+            return agent
+            
+        # Base classes aren't indexed; scan for a subclass instance
         for agents in self.mode_agents.values():
             for agent in agents:
                 if isinstance(agent, agent_type):
@@ -157,6 +249,10 @@ class AgentManager:
         # TODO: Convert location name to MapLocation
         return False
     
+    def shutdown(self) -> None:
+        """Stop the analysis worker threads."""
+        self._pool.shutdown(wait=False)
+    
     def handle_error(self, error: Exception) -> None:
         """Handle an error that occurred during agent management.
         
@@ -6,8 +6,7 @@ from typing import List, Dict, Any, Optional
 from utils.command_queue import CommandQueue, GameCommand
 from utils.logger import get_logger
 from ai.agent import Agent
-from utils.llm_api import get_provider
-import json
+from utils.llm_api import extract_json, get_provider, to_json
 
 logger = get_logger("pokemon_player")
 
@@ -40,6 +39,13 @@ Return your response in this exact format:
     "reasoning": "Explanation of battle strategy and move choices"
 }"""
 
+# The prompt's JSON example is full of literal braces, so it is split around
+# its placeholders once instead of going through str.format
+_PROMPT_HEAD, _rest = BATTLE_PROMPT.split("{screen_state}")
+_PROMPT_MID, _rest = _rest.split("{game_state}")
+_PROMPT_CONTEXT, _PROMPT_TAIL = _rest.split("{context}")
+del _rest
+
 class BattleAgent(Agent):
     """Agent specialized in battle management"""
     
@@ -87,69 +93,97 @@ class BattleAgent(Agent):
             List of commands for battle actions
         """
         try:
-            # Enrich context with battle-specific info
-            battle_context = context or {}
-            if game_state:
-                # Add active Pokemon data
-                active_pokemon = game_state.get("active_pokemon", {})
-                battle_context["active_pokemon"] = active_pokemon
-                
-                # Add opponent Pokemon data
-                opponent_pokemon = game_state.get("opponent_pokemon", {})
-                battle_context["opponent_pokemon"] = opponent_pokemon
-                
-                # Add party status
-                party_data = game_state.get("party", {})
-                battle_context["party"] = party_data
-            
-            # Format prompt with current state
-            prompt = BATTLE_PROMPT.format(
-                screen_state=screen_state,
-                game_state=game_state,
-                context=battle_context
-            )
+            prompt = self._format_prompt(screen_state, game_state, context)
             
             # Get battle commands from LLM
             response = self.llm.query(prompt)
             
-            # Parse commands
-            try:
-                # Extract JSON from response
-                start = response.find('{')
-                end = response.rfind('}') + 1
-                if start >= 0 and end > start:
-                    json_str = response[start:end]
-                    data = json.loads(json_str)
-                else:
-                    raise ValueError("No JSON object found in response")
-                    
-                # Log reasoning
-                if "reasoning" in data:
-                    logger.info(f"Battle strategy reasoning: {data['reasoning']}")
-                    
-                # Convert to commands
-                commands = []
-                for cmd in data.get("commands", []):
-                    if cmd["type"] == "button_press":
-                        command = CommandQueue.create_button_press(
-                            button=cmd["button"],
-                            duration=cmd.get("duration", 0.1),
-                            delay=cmd.get("delay", 0.0)
-                        )
-                        commands.append(command)
-                    elif cmd["type"] == "wait":
-                        command = CommandQueue.create_wait(
-                            duration=cmd["duration"],
-                            delay=cmd.get("delay", 0.0)
-                        )
-                        commands.append(command)
-                        
-                return commands
+            return self._parse_commands(response)
                 
-            except Exception as e:
-                logger.error(f"Error parsing battle commands: {e}")
-                return []
+        except Exception as e:
+            logger.error(f"Error generating battle strategy: {e}")
+            return []
+            
+    async def agenerate_commands(self, 
+                                 screen_state: Dict[str, Any],
+                                 game_state: Dict[str, Any],
+                                 context: Optional[Dict[str, Any]] = None) -> List[GameCommand]:
+        """Generate battle commands without blocking the event loop on the LLM.
+        
+        Args:
+            screen_state: Current screen analysis results
+            game_state: Current game memory state
+            context: Optional additional context
+            
+        Returns:
+            List of commands for battle actions
+        """
+        try:
+            prompt = self._format_prompt(screen_state, game_state, context)
+            response = await self.llm.aquery(prompt)
+            return self._parse_commands(response)
                 
         except Exception as e:
             logger.error(f"Error generating battle strategy: {e}")
-            return [] 
\ No newline at end of file
+            return []
+            
+    def _format_prompt(self, 
+                       screen_state: Dict[str, Any],
+                       game_state: Dict[str, Any],
+                       context: Optional[Dict[str, Any]] = None) -> str:
+        """Format the battle prompt for the LLM.
+        
+        Args:
+            screen_state: Current screen analysis results
+            game_state: Current game memory state
+            context: Optional additional context
+            
+        Returns:
+            Formatted prompt string
+        """
+        # Enrich context with battle-specific info
+        battle_context = context or {}
+        if game_state:
+            # Add active Pokemon data
+            active_pokemon = game_state.get("active_pokemon", {})
+            battle_context["active_pokemon"] = active_pokemon
+            
+            # Add opponent Pokemon data
+            opponent_pokemon = game_state.get("opponent_pokemon", {})
+            battle_context["opponent_pokemon"] = opponent_pokemon
+            
+            # Add party status
+            party_data = game_state.get("party", {})
+            battle_context["party"] = party_data
+        
+        # Fill in the prompt with the state serialized as JSON
+        return "".join((
+            _PROMPT_HEAD, to_json(screen_state),
+            _PROMPT_MID, to_json(game_state),
+            _PROMPT_CONTEXT, to_json(battle_context),
+            _PROMPT_TAIL
+        ))
+        
+    def _parse_commands(self, response: str) -> List[GameCommand]:
+        """Parse an LLM response into battle commands.
+        
+        Args:
+            response: LLM response string
+            
+        Returns:
+            List of parsed commands
+        """
+        try:
+            # Extract JSON from response
+            data = extract_json(response)
+                
+            # Log reasoning
+            if "reasoning" in data:
+                logger.info("Battle strategy reasoning: %s", data["reasoning"])
+                
+            # Convert to commands
+            return CommandQueue.from_dicts(data.get("commands", []))
+            
+        except Exception as e:
+            logger.error(f"Error parsing battle commands: {e}")
+            return []
@@ -2,12 +2,14 @@
 Command generation for game automation
 """
 
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
-import json
 import os
+import threading
+import time
 from utils.command_queue import CommandQueue, GameCommand
 from utils.logger import get_logger
-from utils.llm_api import get_provider
+from utils.llm_api import extract_json, get_provider
 
 logger = get_logger("pokemon_player")
 
@@ -57,6 +59,13 @@ You must respond with a valid JSON object in this exact format:
 class CommandGenerator:
     """Generates game commands based on screen state"""
     
+    # Attempts per background LLM request, and seconds between attempts
+    MAX_RETRIES = 3
+    RETRY_DELAY = 5.0
+    
+    # Seconds poll_commands waits on a background request before giving up
+    REQUEST_TIMEOUT = 30.0
+    
     def __init__(self, provider: str = "openai"):
         """Initialize command generator.
         
@@ -65,6 +74,13 @@ class CommandGenerator:
         """
         self.llm = get_provider("openai")  # Force OpenAI
         
+        # Background LLM request in flight for poll_commands, if any, and
+        # the event that stops its retries once it is abandoned
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm")
+        self._pending: Optional[Future] = None
+        self._pending_since = 0.0
+        self._abandoned = threading.Event()
+        
     def generate_commands(self, screen_state: Dict[str, Any], context: Optional[Dict[str, Any]] = None) -> List[GameCommand]:
         """Generate commands based on current state.
         
@@ -89,6 +105,89 @@ class CommandGenerator:
             logger.error(f"Error generating commands: {e}")
             return self._generate_fallback_commands(screen_state)
             
+    async def agenerate_commands(self, screen_state: Dict[str, Any], context: Optional[Dict[str, Any]] = None) -> List[GameCommand]:
+        """Generate commands without blocking the event loop on the LLM.
+        
+        Args:
+            screen_state: Current screen analysis results
+            context: Optional additional context
+            
+        Returns:
+            List of commands to execute
+        """
+        try:
+            prompt = self._format_prompt(screen_state, context)
+            response = await self.llm.aquery(prompt)
+            return self._parse_commands(response)
+            
+        except Exception as e:
+            logger.error(f"Error generating commands: {e}")
+            return self._generate_fallback_commands(screen_state)
+            
+    def poll_commands(self, screen_state: Dict[str, Any], context: Optional[Dict[str, Any]] = None) -> List[GameCommand]:
+        """Get commands without waiting on the LLM.
+        
+        Starts a background LLM request when none is in flight and returns
+        its commands on the first call after it finishes. Until then no
+        commands are returned; the fallback commands are used only if the
+        request fails or takes longer than REQUEST_TIMEOUT.
+        
+        Args:
+            screen_state: Current screen analysis results
+            context: Optional additional context
+            
+        Returns:
+            List of commands to execute
+        """
+        if self._pending is None:
+            prompt = self._format_prompt(screen_state, context)
+            self._abandoned = threading.Event()
+            self._pending = self._executor.submit(self._query_with_retry, prompt, self._abandoned)
+            self._pending_since = time.monotonic()
+            
+        if not self._pending.done():
+            if time.monotonic() - self._pending_since < self.REQUEST_TIMEOUT:
+                return []
+            # Abandon the request and drop its late response. Its worker may
+            # still be stuck in the call, so later requests get a fresh one.
+            self._abandoned.set()
+            self._pending = None
+            self._executor.shutdown(wait=False)
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm")
+            logger.error(f"LLM request timed out after {self.REQUEST_TIMEOUT}s")
+            return self._generate_fallback_commands(screen_state)
+            
+        future, self._pending = self._pending, None
+        try:
+            return self._parse_commands(future.result())
+        except Exception as e:
+            logger.error(f"Error generating commands: {e}")
+            return self._generate_fallback_commands(screen_state)
+            
+    def shutdown(self) -> None:
+        """Stop the background LLM worker."""
+        self._executor.shutdown(wait=False)
+        
+    def _query_with_retry(self, prompt: str, abandoned: threading.Event) -> str:
+        """Query the LLM, retrying failed requests.
+        
+        Args:
+            prompt: Formatted prompt
+            abandoned: Set once nobody waits for the answer; stops retrying
+            
+        Returns:
+            LLM response text
+        """
+        for attempt in range(1, self.MAX_RETRIES + 1):
+            try:
+                return self.llm.query(prompt)
+            except Exception as e:
+                if attempt == self.MAX_RETRIES or abandoned.is_set():
+                    raise
+                logger.warning(f"LLM query failed (attempt {attempt}/{self.MAX_RETRIES}): {e}")
+                if abandoned.wait(self.RETRY_DELAY):
+                    raise
+                
     def _generate_fallback_commands(self, screen_state: Dict[str, Any]) -> List[GameCommand]:
         """Generate basic navigation commands when LLM is unavailable.
         
@@ -148,36 +247,14 @@ Return your response in this exact format:
         """
         try:
             # Extract JSON from response
-            start = response.find('{')
-            end = response.rfind('}') + 1
-            if start >= 0 and end > start:
-                json_str = response[start:end]
-                data = json.loads(json_str)
-            else:
-                raise ValueError("No JSON object found in response")
+            data = extract_json(response)
                 
             # Log reasoning
             if "reasoning" in data:
-                logger.info(f"Command generation reasoning: {data['reasoning']}")
+                logger.info("Command generation reasoning: %s", data["reasoning"])
                 
             # Convert to commands
-            commands = []
-            for cmd in data.get("commands", []):
-                if cmd["type"] == "button_press":
-                    command = CommandQueue.create_button_press(
-                        button=cmd["button"],
-                        duration=cmd.get("duration", 0.1),
-                        delay=cmd.get("delay", 0.0)
-                    )
-                    commands.append(command)
-                elif cmd["type"] == "wait":
-                    command = CommandQueue.create_wait(
-                        duration=cmd["duration"],
-                        delay=cmd.get("delay", 0.0)
-                    )
-                    commands.append(command)
-                    
-            return commands
+            return CommandQueue.from_dicts(data.get("commands", []))
             
         except Exception as e:
             logger.error(f"Error parsing commands: {e}")
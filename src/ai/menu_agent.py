@@ -2,26 +2,19 @@
 Menu navigation agent
 """
 
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional
 from utils.command_queue import CommandQueue, GameCommand
 from utils.logger import get_logger
 from ai.agent import Agent
-from utils.llm_api import get_provider
-import json
+from utils.llm_api import extract_json, get_provider, to_json
 
 logger = get_logger("pokemon_player")
 
+# Static instructions come first and the state last, so providers that cache
+# prompt prefixes can reuse everything up to the state
 MENU_PROMPT = """You are a menu navigation expert for Pokemon games. Your task is to navigate menus efficiently to achieve objectives.
 
-Current screen state:
-{screen_state}
-
-Game state:
-{game_state}
-
-Context:
-{context}
-
 Generate a sequence of button presses to navigate the menu. Consider:
 1. Current menu position
 2. Target menu item
@@ -37,11 +30,32 @@ Return your response in this exact format:
         ...
     ],
     "reasoning": "Explanation of menu navigation strategy"
-}"""
+}
+
+---
+Current screen state:
+{screen_state}
+
+Game state:
+{game_state}
+
+Context:
+{context}
+"""
+
+# The prompt's JSON example is full of literal braces, so it is split around
+# its placeholders once instead of going through str.format
+_PROMPT_HEAD, _rest = MENU_PROMPT.split("{screen_state}")
+_PROMPT_MID, _rest = _rest.split("{game_state}")
+_PROMPT_CONTEXT, _PROMPT_TAIL = _rest.split("{context}")
+del _rest
 
 class MenuAgent(Agent):
     """Agent specialized in menu navigation"""
     
+    # Most prompts whose commands are remembered, evicting the least recently used
+    RESPONSE_CACHE_SIZE = 512
+    
     def __init__(self, provider: str = "openai"):
         """Initialize menu agent.
         
@@ -51,6 +65,9 @@ class MenuAgent(Agent):
         super().__init__("MenuAgent")
         self.llm = get_provider(provider)
         
+        # Prompt -> parsed commands, so an unchanged menu skips the LLM call
+        self._response_cache: "OrderedDict[str, List[GameCommand]]" = OrderedDict()
+        
     def can_handle(self, screen_state: Dict[str, Any], game_state: Dict[str, Any]) -> bool:
         """Check if current state is a menu that needs navigation.
         
@@ -74,61 +91,69 @@ class MenuAgent(Agent):
     def generate_commands(self, 
                          screen_state: Dict[str, Any],
                          game_state: Dict[str, Any],
-                         context: Optional[Dict[str, Any]] = None) -> List[GameCommand]:
+                         context: Optional[Dict[str, Any]] = None,
+                         bypass_cache: bool = False) -> List[GameCommand]:
         """Generate menu navigation commands.
         
         Args:
             screen_state: Current screen analysis results
             game_state: Current game memory state
             context: Optional additional context
+            bypass_cache: Query the LLM even if this prompt was answered before
             
         Returns:
             List of commands for menu navigation
         """
         try:
-            # Format prompt with current state
-            prompt = MENU_PROMPT.format(
-                screen_state=screen_state,
-                game_state=game_state,
-                context=context or {}
-            )
+            # Fill in the prompt with the state serialized as JSON; sorted
+            # keys make equal states produce identical prompts
+            prompt = "".join((
+                _PROMPT_HEAD, to_json(screen_state, sort_keys=True),
+                _PROMPT_MID, to_json(game_state, sort_keys=True),
+                _PROMPT_CONTEXT, to_json(context or {}, sort_keys=True),
+                _PROMPT_TAIL
+            ))
+            
+            if not bypass_cache and prompt in self._response_cache:
+                self._response_cache.move_to_end(prompt)
+                return list(self._response_cache[prompt])
+                
+            commands = self._query_commands(prompt)
+            if commands:
+                self._response_cache[prompt] = commands
+                self._response_cache.move_to_end(prompt)
+                if len(self._response_cache) > self.RESPONSE_CACHE_SIZE:
+                    self._response_cache.popitem(last=False)
+            return list(commands)
+            
+        except Exception as e:
+            logger.error(f"Error generating menu navigation: {e}")
+            return []
+            
+    def _query_commands(self, prompt: str) -> List[GameCommand]:
+        """Query the LLM and parse its navigation commands.
+        
+        Args:
+            prompt: Formatted prompt
             
+        Returns:
+            List of commands, empty if the response couldn't be parsed
+        """
+        try:
             # Get navigation commands from LLM
             response = self.llm.query(prompt)
             
             # Parse commands
             try:
                 # Extract JSON from response
-                start = response.find('{')
-                end = response.rfind('}') + 1
-                if start >= 0 and end > start:
-                    json_str = response[start:end]
-                    data = json.loads(json_str)
-                else:
-                    raise ValueError("No JSON object found in response")
+                data = extract_json(response)
                     
                 # Log reasoning
                 if "reasoning" in data:
-                    logger.info(f"Menu navigation reasoning: {data['reasoning']}")
+                    logger.info("Menu navigation reasoning: %s", data["reasoning"])
                     
                 # Convert to commands
-                commands = []
-                for cmd in data.get("commands", []):
-                    if cmd["type"] == "button_press":
-                        command = CommandQueue.create_button_press(
-                            button=cmd["button"],
-                            duration=cmd.get("duration", 0.1),
-                            delay=cmd.get("delay", 0.0)
-                        )
-                        commands.append(command)
-                    elif cmd["type"] == "wait":
-                        command = CommandQueue.create_wait(
-                            duration=cmd["duration"],
-                            delay=cmd.get("delay", 0.0)
-                        )
-                        commands.append(command)
-                        
-                return commands
+                return CommandQueue.from_dicts(data.get("commands", []))
                 
             except Exception as e:
                 logger.error(f"Error parsing menu navigation commands: {e}")
@@ -4,12 +4,12 @@ Navigation Agent Module
 This module handles navigation and pathfinding in the game world.
 """
 
-from typing import Dict, Optional, Tuple, List
+from typing import Dict, Optional, List, Set
 from dataclasses import dataclass
 from enum import Enum, auto
 import logging
+import threading
 
-from utils.logger import get_logger
 from emulator.interface import EmulatorInterface
 from emulator.game_state import GameState, GameMode
 from .agent import Agent, AgentAction
@@ -17,6 +17,10 @@ from .agent import Agent, AgentAction
 # Get logger for this module
 logger = logging.getLogger(__name__)
 
+# Unit step (dx, dy) -> emulator button / movement action
+STEP_BUTTONS = {(1, 0): 'right', (-1, 0): 'left', (0, 1): 'down', (0, -1): 'up'}
+STEP_MOVES = {(1, 0): "MOVE_RIGHT", (-1, 0): "MOVE_LEFT", (0, 1): "MOVE_DOWN", (0, -1): "MOVE_UP"}
+
 class NavigationMode(Enum):
     """Different modes of navigation."""
     EXPLORE = auto()  # Free exploration
@@ -25,7 +29,11 @@ class NavigationMode(Enum):
 
 @dataclass
 class MapLocation:
-    """Represents a location in the game world."""
+    """Represents a location in the game world.
+    
+    x, y and map_id identify the location and must not change after
+    creation; its identity key and hash are computed once.
+    """
     name: str
     x: int
     y: int
@@ -35,16 +43,17 @@ class MapLocation:
     def __post_init__(self):
         if self.connections is None:
             self.connections = []
+        # Identity, cached for the many hash and equality checks A* makes
+        self._key = (self.x, self.y, self.map_id)
+        self._hash = hash(self._key)
             
     def __eq__(self, other):
         if not isinstance(other, MapLocation):
             return False
-        return (self.x == other.x and 
-                self.y == other.y and 
-                self.map_id == other.map_id)
+        return self._key == other._key
                 
     def __hash__(self):
-        return hash((self.x, self.y, self.map_id))
+        return self._hash
         
     def distance_to(self, other: 'MapLocation') -> float:
         """Calculate Manhattan distance to another location.
@@ -59,11 +68,59 @@ class MapLocation:
             return float('inf')
         return abs(self.x - other.x) + abs(self.y - other.y)
 
+class MapRegistry:
+    """Locations known per map, shareable between navigation agents.
+    
+    Each NavigationAgent gets its own registry unless one is passed in;
+    agents given the same registry see the locations each other visit.
+    """
+    
+    def __init__(self):
+        """Initialize an empty registry."""
+        self.known_locations: Dict[str, List[MapLocation]] = {}  # Map ID -> List[MapLocation]
+        # Location names known per map, for connection checks
+        self._location_names: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        
+    def add(self, location: MapLocation) -> None:
+        """Record a location, ignoring ones already known.
+        
+        Args:
+            location: Location to record
+        """
+        with self._lock:
+            locations = self.known_locations.setdefault(location.map_id, [])
+            if location not in locations:
+                locations.append(location)
+                self._location_names.setdefault(location.map_id, set()).add(location.name)
+                
+    def location_names(self, map_id: str) -> Set[str]:
+        """Get the names of the locations known on a map.
+        
+        Args:
+            map_id: Map to look up
+            
+        Returns:
+            Set of location names, empty if the map is unknown
+        """
+        return self._location_names.get(map_id, set())
+        
+    def clear(self) -> None:
+        """Forget all locations."""
+        with self._lock:
+            self.known_locations.clear()
+            self._location_names.clear()
+
 class NavigationAgent(Agent):
-    """Agent specialized for handling overworld navigation."""
+    """Agent specialized for handling overworld navigation.
+    
+    Map knowledge lives in a MapRegistry. Pass the same registry to several
+    agents to share it; otherwise each agent keeps its own.
+    """
     
     def __init__(self, name: str, emulator: EmulatorInterface, mode: NavigationMode = NavigationMode.EXPLORE,
-                 target_x: Optional[int] = None, target_y: Optional[int] = None):
+                 target_x: Optional[int] = None, target_y: Optional[int] = None,
+                 map_registry: Optional[MapRegistry] = None):
         """Initialize the navigation agent.
         
         Args:
@@ -72,14 +129,25 @@ class NavigationAgent(Agent):
             mode: Navigation mode to use
             target_x: Optional target X coordinate
             target_y: Optional target Y coordinate
+            map_registry: Optional registry shared with other agents
         """
-        super().__init__(name, emulator)
+        super().__init__(name)
+        self.emulator = emulator
+        self.map_registry = map_registry if map_registry is not None else MapRegistry()
+        self.known_locations = self.map_registry.known_locations  # Map ID -> List[MapLocation]
         self.mode = mode
         self.target_x = target_x
         self.target_y = target_y
         self.current_location = None
+        self.current_location_connections: Set[str] = set()
         self.target_location = None
-        self.known_locations = {}  # Map ID -> List[MapLocation]
+        
+        # Movement handler per navigation mode, looked up once per move
+        self._movement_handlers = {
+            NavigationMode.EXPLORE: self._handle_exploration,
+            NavigationMode.PATHFIND: self._handle_pathfinding,
+            NavigationMode.BACKTRACK: self._handle_backtracking
+        }
         logger.info(f"Initialized navigation agent with mode: {mode}")
     
     def analyze_state(self, state: GameState) -> Optional[AgentAction]:
@@ -92,17 +160,17 @@ class NavigationAgent(Agent):
             AgentAction if one should be taken, None otherwise
         """
         if state.mode != GameMode.OVERWORLD:
-            logger.debug(f"Agent {self.name} cannot handle non-overworld state")
+            logger.debug("Agent %s cannot handle non-overworld state", self.name)
             return None
         
         # Check if we've reached target
         if self._at_target(state):
-            logger.info(f"Agent {self.name} reached target location")
+            logger.info("Agent %s reached target location", self.name)
             return None
         
         # Determine movement direction
         if self._should_move(state):
-            logger.debug(f"Agent {self.name} deciding movement direction")
+            logger.debug("Agent %s deciding movement direction", self.name)
             return AgentAction.MOVE
         
         return None
@@ -118,7 +186,7 @@ class NavigationAgent(Agent):
             True if action was executed successfully
         """
         if action != AgentAction.MOVE:
-            logger.warning(f"Agent {self.name} received invalid action: {action}")
+            logger.warning("Agent %s received invalid action: %s", self.name, action)
             return False
         
         return self._handle_movement(state)
@@ -165,12 +233,8 @@ class NavigationAgent(Agent):
             True if movement was successful
         """
         try:
-            if self.mode == NavigationMode.EXPLORE:
-                return self._handle_exploration(state)
-            elif self.mode == NavigationMode.PATHFIND:
-                return self._handle_pathfinding(state)
-            else:
-                return self._handle_backtracking(state)
+            handler = self._movement_handlers.get(self.mode, self._handle_backtracking)
+            return handler(state)
             
         except Exception as e:
             logger.error(f"Error handling movement: {e}")
@@ -208,12 +272,8 @@ class NavigationAgent(Agent):
         dy = self.target_y - state.player.y_position
         
         # Move in the direction of larger difference
-        if abs(dx) > abs(dy):
-            button = 'right' if dx > 0 else 'left'
-        else:
-            button = 'down' if dy > 0 else 'up'
-        
-        self.emulator.press_button(button)
+        step = ((dx > 0) - (dx < 0), 0) if abs(dx) > abs(dy) else (0, 1 if dy > 0 else -1)
+        self.emulator.press_button(STEP_BUTTONS[step])
         return True
     
     def _handle_backtracking(self, state: GameState) -> bool:
@@ -236,10 +296,12 @@ class NavigationAgent(Agent):
             location: Current location
         """
         self.current_location = location
-        if location.map_id not in self.known_locations:
-            self.known_locations[location.map_id] = []
-        if location not in self.known_locations[location.map_id]:
-            self.known_locations[location.map_id].append(location)
+        self.current_location_connections = set(location.connections)
+        self.map_registry.add(location)
+                
+    def clear_map_data(self) -> None:
+        """Forget the known locations, for every agent sharing the registry."""
+        self.map_registry.clear()
             
     def set_target_location(self, location: MapLocation) -> bool:
         """Set the target location.
@@ -270,8 +332,8 @@ class NavigationAgent(Agent):
             return True
             
         # Check connections
-        return any(loc.name in self.current_location.connections 
-                  for loc in self.known_locations.get(location.map_id, []))
+        names = self.map_registry.location_names(location.map_id)
+        return not names.isdisjoint(self.current_location_connections)
                   
     def get_next_move(self) -> Optional[str]:
         """Get the next movement action.
@@ -288,7 +350,5 @@ class NavigationAgent(Agent):
         dx = self.target_location.x - self.current_location.x
         dy = self.target_location.y - self.current_location.y
         
-        if abs(dx) > abs(dy):
-            return "MOVE_RIGHT" if dx > 0 else "MOVE_LEFT"
-        else:
-            return "MOVE_DOWN" if dy > 0 else "MOVE_UP" 
\ No newline at end of file
+        step = ((dx > 0) - (dx < 0), 0) if abs(dx) > abs(dy) else (0, 1 if dy > 0 else -1)
+        return STEP_MOVES[step] 
\ No newline at end of file
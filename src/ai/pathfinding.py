@@ -4,31 +4,87 @@ Pathfinding Module
 This module implements pathfinding algorithms for navigation.
 """
 
+import hashlib
 import heapq
-from typing import List, Dict, Set, Optional
+import itertools
+import json
+import sys
+from collections import OrderedDict, deque
+from typing import List, Dict, Optional, Tuple
 import logging
 
-from .navigation_agent import MapLocation
+import numpy as np
+
+from .navigation_agent import STEP_MOVES, MapLocation
+from ._pathfinding_kernels import MAX_GRID_CELLS, NUMBA_AVAILABLE, astar_grid, trace_path
 
 logger = logging.getLogger(__name__)
 
 class PathFinder:
     """A* pathfinding implementation."""
     
+    # Most paths remembered, evicting the least recently used
+    PATH_CACHE_SIZE = 128
+    
+    # Default node expansions per find_path_iter call
+    ITERATIONS_PER_TICK = 200
+    
     def __init__(self):
         """Initialize pathfinder."""
         self.known_locations = {}  # Map ID -> List[MapLocation]
         
+        # Lookup indexes so neighbor queries don't scan every location
+        self._grid: Dict[Tuple[str, int, int], MapLocation] = {}  # (map ID, x, y) -> location
+        self._by_name: Dict[str, List[MapLocation]] = {}  # Name -> locations
+        
+        # The search works on integer node IDs so it never hashes or compares
+        # MapLocations; each node's (neighbor ID, step cost) list is filled
+        # in the first time the node is expanded
+        self._ids: Dict[Tuple[int, int, str], int] = {}  # (x, y, map ID) -> node ID
+        self._locations: List[MapLocation] = []
+        self._adjacency: List[Optional[List[Tuple[int, float]]]] = []
+        
+        # (start, goal) -> path found for it
+        self._path_cache: "OrderedDict[Tuple[MapLocation, MapLocation], List[MapLocation]]" = OrderedDict()
+        
+        # Search advanced a slice at a time by find_path_iter, and its (start, goal)
+        self.iterations_per_tick = self.ITERATIONS_PER_TICK
+        self._pending_search = None
+        self._pending_key: Optional[Tuple[MapLocation, MapLocation]] = None
+        
     def add_location(self, location: MapLocation):
         """Add a location to the known locations.
         
         Args:
             location: Location to add
         """
-        if location.map_id not in self.known_locations:
-            self.known_locations[location.map_id] = []
-        if location not in self.known_locations[location.map_id]:
-            self.known_locations[location.map_id].append(location)
+        key = (location.map_id, location.x, location.y)
+        if key in self._grid:
+            return
+            
+        self._grid[key] = location
+        self._by_name.setdefault(location.name, []).append(location)
+        self.known_locations.setdefault(location.map_id, []).append(location)
+        self._ids[location._key] = len(self._locations)
+        self._locations.append(location)
+        
+        # A new location can open shorter routes
+        self.clear_path_cache()
+            
+    def clear_path_cache(self) -> None:
+        """Forget cached paths; call after changing a location's connections."""
+        self._path_cache.clear()
+        self._adjacency = [None] * len(self._locations)
+        self._pending_search = None
+        self._pending_key = None
+        
+    def set_iterations_per_tick(self, iterations: int) -> None:
+        """Set how many nodes find_path_iter expands per call.
+        
+        Args:
+            iterations: Node expansions per call, at least 1
+        """
+        self.iterations_per_tick = max(1, iterations)
             
     def get_neighbors(self, location: MapLocation) -> List[MapLocation]:
         """Get neighboring locations.
@@ -41,17 +97,18 @@ class PathFinder:
         """
         neighbors = []
         
-        # Same map neighbors
-        for loc in self.known_locations.get(location.map_id, []):
-            if loc != location and loc.distance_to(location) == 1:
+        # Same map neighbors: probe the four adjacent tiles
+        map_id, x, y = location.map_id, location.x, location.y
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            loc = self._grid.get((map_id, x + dx, y + dy))
+            if loc is not None:
                 neighbors.append(loc)
                 
         # Connected map neighbors
-        for map_id, locations in self.known_locations.items():
-            if map_id != location.map_id:
-                for loc in locations:
-                    if loc.name in location.connections:
-                        neighbors.append(loc)
+        for name in location.connections:
+            for loc in self._by_name.get(name, ()):
+                if loc.map_id != map_id:
+                    neighbors.append(loc)
                         
         return neighbors
         
@@ -68,33 +125,160 @@ class PathFinder:
         if not start or not goal:
             return None
             
-        # A* algorithm
-        frontier = [(0, start)]  # Priority queue of (f_score, location)
-        came_from = {start: None}
-        g_score = {start: 0}  # Cost from start
-        f_score = {start: start.distance_to(goal)}  # Estimated total cost
+        key = (start, goal)
+        path = self._path_cache.get(key)
+        if path is not None:
+            self._path_cache.move_to_end(key)
+            return list(path)
+            
+        return self._remember_path(key, self._search(start, goal))
+        
+    def find_path_iter(self, start: MapLocation, goal: MapLocation,
+                       max_iters: Optional[int] = None) -> Tuple[bool, Optional[List[MapLocation]]]:
+        """Advance a path search by a bounded number of node expansions.
+        
+        Call once per tick with the same start and goal until it reports
+        done, so a long search never stalls a single frame. Asking for a
+        different start or goal abandons the search in progress.
+        
+        Args:
+            start: Starting location
+            goal: Target location
+            max_iters: Node expansions for this call; defaults to iterations_per_tick
+            
+        Returns:
+            Tuple of (done, path). Path is the same as find_path's once done,
+            and None while the search is still running
+        """
+        if not start or not goal:
+            return True, None
+            
+        key = (start, goal)
+        path = self._path_cache.get(key)
+        if path is not None:
+            self._path_cache.move_to_end(key)
+            return True, list(path)
+            
+        if self._pending_key != key:
+            self._pending_search = self._search_steps(start, goal)
+            next(self._pending_search)
+            self._pending_key = key
+            
+        try:
+            self._pending_search.send(max_iters or self.iterations_per_tick)
+        except StopIteration as stop:
+            self._pending_search = None
+            self._pending_key = None
+            return True, self._remember_path(key, stop.value)
+        return False, None
+        
+    def _remember_path(self, key: Tuple[MapLocation, MapLocation],
+                       path: Optional[List[MapLocation]]) -> Optional[List[MapLocation]]:
+        """Cache a search result and hand back the caller's copy.
+        
+        Args:
+            key: (start, goal) searched
+            path: Path found, or None
+            
+        Returns:
+            Copy of the path, or None if no path exists
+        """
+        if path is None:
+            return None
+        self._path_cache[key] = path
+        if len(self._path_cache) > self.PATH_CACHE_SIZE:
+            self._path_cache.popitem(last=False)
+        return list(path)
+        
+    def _search(self, start: MapLocation, goal: MapLocation) -> Optional[List[MapLocation]]:
+        """Run A* between two locations to completion.
+        
+        Args:
+            start: Starting location
+            goal: Target location
+            
+        Returns:
+            List of locations forming the path, or None if no path exists
+        """
+        steps = self._search_steps(start, goal)
+        next(steps)
+        try:
+            steps.send(sys.maxsize)
+        except StopIteration as stop:
+            return stop.value
+        return None  # Unreachable: the budget outlasts any search
+        
+    def _search_steps(self, start: MapLocation, goal: MapLocation):
+        """A* between two locations, as a generator that can pause.
+        
+        Prime it with next(), then send an expansion budget. It yields when
+        the budget is spent, waiting for the next budget, and returns the
+        path (or None) through StopIteration when the search ends.
+        
+        Args:
+            start: Starting location
+            goal: Target location
+        """
+        budget = yield
+        
+        # An unknown start gets ID -1; an unknown goal can only be reached
+        # by starting on it
+        ids = self._ids
+        start_id = ids.get(start._key, -1)
+        goal_id = start_id if start == goal else ids.get(goal._key)
+        if goal_id is None:
+            return None
+            
+        locations = self._locations
+        adjacency = self._adjacency
+        
+        # A* algorithm. The counter breaks f_score ties in push order.
+        counter = itertools.count()
+        frontier = [(0, next(counter), start_id)]  # Priority queue of (f_score, tiebreak, node ID)
+        came_from = {start_id: None}
+        g_score = {start_id: 0}  # Cost from start
+        closed = set()  # Expanded nodes; their heap entries may linger
         
         while frontier:
-            current = heapq.heappop(frontier)[1]
+            if budget <= 0:
+                budget = yield
+                
+            current = heapq.heappop(frontier)[2]
             
-            if current == goal:
+            # Stale entry for a node already expanded via a better path
+            if current in closed:
+                continue
+            closed.add(current)
+            budget -= 1
+            
+            if current == goal_id:
                 # Reconstruct path
                 path = []
-                while current:
-                    path.append(current)
+                while current is not None:
+                    path.append(locations[current] if current >= 0 else start)
                     current = came_from[current]
                 path.reverse()
+                path[0] = start
                 return path
                 
-            for neighbor in self.get_neighbors(current):
-                tentative_g = g_score[current] + current.distance_to(neighbor)
+            edges = adjacency[current] if current >= 0 else None
+            if edges is None:
+                location = locations[current] if current >= 0 else start
+                edges = [(ids[neighbor._key], location.distance_to(neighbor))
+                         for neighbor in self.get_neighbors(location)]
+                if current >= 0:
+                    adjacency[current] = edges
+                    
+            for neighbor, cost in edges:
+                if neighbor in closed:
+                    continue
+                tentative_g = g_score[current] + cost
                 
                 if neighbor not in g_score or tentative_g < g_score[neighbor]:
                     came_from[neighbor] = current
                     g_score[neighbor] = tentative_g
-                    f = tentative_g + neighbor.distance_to(goal)
-                    f_score[neighbor] = f
-                    heapq.heappush(frontier, (f, neighbor))
+                    f = tentative_g + locations[neighbor].distance_to(goal)
+                    heapq.heappush(frontier, (f, next(counter), neighbor))
                     
         return None  # No path found
         
@@ -116,13 +300,575 @@ class PathFinder:
         dx = next_loc.x - current.x
         dy = next_loc.y - current.y
         
-        if dx > 0:
-            return "MOVE_RIGHT"
-        elif dx < 0:
-            return "MOVE_LEFT"
-        elif dy > 0:
-            return "MOVE_DOWN"
-        elif dy < 0:
-            return "MOVE_UP"
+        # Horizontal moves take precedence; no step means no move
+        if dx:
+            return STEP_MOVES[((dx > 0) - (dx < 0), 0)]
+        return STEP_MOVES.get((0, (dy > 0) - (dy < 0)))
+
+class GridPathFinder:
+    """A* pathfinding over a collision grid.
+    
+    Cells are addressed by flat index y * width + x, and the search state
+    lives in flat per-cell arrays rather than dicts of location objects.
+    """
+    
+    # Grid steps, as (dx, dy)
+    STEPS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+    
+    # Most goals whose heuristic tables are kept
+    HEURISTIC_CACHE_SIZE = 8
+    
+    # Most paths remembered, evicting the least recently used
+    PATH_CACHE_SIZE = 256
+    
+    def __init__(self, collision_map: np.ndarray):
+        """Initialize pathfinder.
+        
+        Args:
+            collision_map: 2D array indexed [y, x]; 0 marks a walkable cell
+        """
+        self.collision_map = collision_map
+        self.height, self.width = collision_map.shape
+        walkable = (collision_map == 0).ravel()
+        # Plain list: per-cell reads in the Python search loop are much
+        # cheaper than indexing into a NumPy array
+        self._walkable = walkable.tolist()
+        # Contiguous copy for the compiled search
+        self._walkable_array = np.ascontiguousarray(walkable, dtype=np.uint8)
+        # Walkable neighbors per cell for the Python search, built on first use
+        self._neighbors: Optional[List[Tuple[int, ...]]] = None
+        # Landmark x cell grid distances for the ALT heuristic, -1 where
+        # unreachable; no rows until precompute_landmarks runs
+        self._landmark_dist = np.empty((0, walkable.size), dtype=np.int32)
+        
+        # Goal index -> flat Manhattan distance of every cell to that goal
+        self._heuristics: "OrderedDict[int, List[int]]" = OrderedDict()
+        
+        # Identifies the map layout in the on-disk path cache
+        digest = hashlib.sha256(str(collision_map.shape).encode())
+        digest.update(np.ascontiguousarray(collision_map).tobytes())
+        self.map_hash = digest.hexdigest()
+        
+        # (start_x, start_y, goal_x, goal_y) -> path
+        self._path_cache: "OrderedDict[Tuple[int, int, int, int], List[Tuple[int, int]]]" = OrderedDict()
+        
+    def _heuristic(self, goal_x: int, goal_y: int) -> List[int]:
+        """Get every cell's estimated distance to a goal, as a flat list.
+        
+        The estimate is the Manhattan distance, raised to the landmark (ALT)
+        bound wherever landmarks give a tighter one.
+        
+        Args:
+            goal_x: Goal X coordinate
+            goal_y: Goal Y coordinate
+            
+        Returns:
+            Distances indexed by flat cell index
+        """
+        key = goal_y * self.width + goal_x
+        table = self._heuristics.get(key)
+        if table is None:
+            # Broadcast a column against a row rather than building full coordinate grids
+            ys, xs = np.ogrid[:self.height, :self.width]
+            table = (np.abs(xs - goal_x) + np.abs(ys - goal_y)).ravel()
+            
+            landmarks = self._landmark_dist
+            if len(landmarks):
+                # |d(cell, L) - d(goal, L)| never overestimates, for any
+                # landmark L that reaches both
+                to_goal = landmarks[:, key]
+                reached = (landmarks >= 0) & (to_goal >= 0)[:, None]
+                bounds = np.where(reached, np.abs(landmarks - to_goal[:, None]), 0)
+                table = np.maximum(table, bounds.max(axis=0))
+                
+            table = table.tolist()
+            self._heuristics[key] = table
+            if len(self._heuristics) > self.HEURISTIC_CACHE_SIZE:
+                self._heuristics.popitem(last=False)
+        return table
+        
+    def _neighbor_table(self) -> List[Tuple[int, ...]]:
+        """Get the walkable neighbors of every cell.
+        
+        Built once per map with array operations, so the search loop reads
+        a ready-made tuple per cell instead of bounds-checking and probing
+        all four steps on every expansion.
+        
+        Returns:
+            Flat indices of walkable neighbors in STEPS order, indexed by flat cell index
+        """
+        if self._neighbors is None:
+            width, height = self.width, self.height
+            walkable = self._walkable_array.astype(bool)
+            ys, xs = np.indices((height, width))
+            columns = []
+            for dx, dy in self.STEPS:
+                nx, ny = xs + dx, ys + dy
+                inside = (nx >= 0) & (nx < width) & (ny >= 0) & (ny < height)
+                target = np.where(inside, ny * width + nx, 0).ravel()
+                columns.append(np.where(inside.ravel() & walkable[target], target, -1))
+            rows = np.stack(columns, axis=1).tolist()
+            self._neighbors = [tuple(n for n in row if n >= 0) for row in rows]
+        return self._neighbors
+        
+    def _grid_distances(self, source: int) -> List[int]:
+        """Count the steps from one cell to every other with breadth-first search.
+        
+        Args:
+            source: Flat index of the starting cell
+            
+        Returns:
+            Step counts indexed by flat cell index, -1 where unreachable
+        """
+        neighbors = self._neighbor_table()
+        dist = [-1] * (self.width * self.height)
+        dist[source] = 0
+        queue = deque([source])
+        while queue:
+            index = queue.popleft()
+            step = dist[index] + 1
+            for neighbor in neighbors[index]:
+                if dist[neighbor] < 0:
+                    dist[neighbor] = step
+                    queue.append(neighbor)
+        return dist
+        
+    def precompute_landmarks(self, count: int = 6) -> None:
+        """Pick landmark cells and record their distances for the ALT heuristic.
+        
+        Landmarks are spread out by farthest-point selection. The first is
+        the cell farthest from the first walkable cell, and each later one
+        is the cell farthest from every landmark so far. Cells no landmark
+        reaches count as infinitely far, so walled-off areas get landmarks
+        too. Every step costs 1, so breadth-first search gives exact
+        distances. Searches then expand far fewer cells on maps where walls
+        make Manhattan distance a poor guess.
+        
+        Args:
+            count: Number of landmarks
+        """
+        walkable = self._walkable_array.astype(bool)
+        cells = np.flatnonzero(walkable)
+        rows = []
+        if cells.size:
+            # Distance to the nearest landmark; -1 keeps walls from being picked
+            nearest = np.where(walkable, np.iinfo(np.int32).max, -1)
+            candidate = int(np.argmax(self._grid_distances(int(cells[0]))))
+            for _ in range(count):
+                dist = np.array(self._grid_distances(candidate), dtype=np.int32)
+                rows.append(dist)
+                reached = dist >= 0
+                nearest[reached] = np.minimum(nearest[reached], dist[reached])
+                candidate = int(np.argmax(nearest))
+                if nearest[candidate] <= 0:
+                    break  # Every walkable cell is already a landmark
+                    
+        if rows:
+            self._landmark_dist = np.ascontiguousarray(np.stack(rows))
         else:
-            return None 
\ No newline at end of file
+            self._landmark_dist = np.empty((0, walkable.size), dtype=np.int32)
+        self._heuristics.clear()
+        logger.info(f"Precomputed {len(rows)} pathfinding landmarks")
+        
+    def is_walkable(self, x: int, y: int) -> bool:
+        """Check if a cell is inside the grid and walkable.
+        
+        Args:
+            x: Cell X coordinate
+            y: Cell Y coordinate
+            
+        Returns:
+            True if the cell can be entered
+        """
+        return 0 <= x < self.width and 0 <= y < self.height and self._walkable[y * self.width + x]
+        
+    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+        """Find path between two cells using A*.
+        
+        Args:
+            start: Starting (x, y) cell
+            goal: Target (x, y) cell
+            
+        Returns:
+            List of (x, y) cells forming the path, or None if no path exists
+        """
+        key = (start[0], start[1], goal[0], goal[1])
+        path = self._path_cache.get(key)
+        if path is not None:
+            self._path_cache.move_to_end(key)
+            return list(path)
+            
+        path = self._search(start, goal)
+        if path is not None:
+            self._path_cache[key] = path
+            if len(self._path_cache) > self.PATH_CACHE_SIZE:
+                self._path_cache.popitem(last=False)
+            return list(path)
+        return None
+        
+    def _search(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+        """Run the A* search between two cells.
+        
+        Args:
+            start: Starting (x, y) cell
+            goal: Target (x, y) cell
+            
+        Returns:
+            List of (x, y) cells forming the path, or None if no path exists
+        """
+        if not self.is_walkable(*start) or not self.is_walkable(*goal):
+            return None
+            
+        width, height = self.width, self.height
+        goal_x, goal_y = goal
+        start_index = start[1] * width + start[0]
+        goal_index = goal_y * width + goal_x
+        
+        if NUMBA_AVAILABLE and width * height <= MAX_GRID_CELLS:
+            came_from = astar_grid(self._walkable_array, width, height, start_index, goal_index,
+                                   self._landmark_dist)
+            if goal_index != start_index and came_from[goal_index] < 0:
+                return None
+            # Reconstruct path, converting cells to (x, y) tuples in bulk
+            cells = trace_path(came_from, goal_index)
+            return list(zip((cells % width).tolist(), (cells // width).tolist()))
+            
+        size = width * height
+        neighbors = self._neighbor_table()
+        came_from = [-1] * size
+        g_score = [size] * size  # No path is longer than the cell count
+        closed = bytearray(size)
+        g_score[start_index] = 0
+        
+        heuristic = self._heuristic(goal_x, goal_y)
+        
+        # Heap keys pack (f, size - g, index) into one int, as in the compiled
+        # search. Breaking f ties towards the larger g follows one of the
+        # equally short routes instead of fanning out over all of them.
+        span = size + 1
+        frontier = [(heuristic[start_index] * span + size) * size + start_index]
+        while frontier:
+            index = heapq.heappop(frontier) % size
+            if index == goal_index:
+                # Reconstruct path
+                path = []
+                while index != -1:
+                    path.append((index % width, index // width))
+                    index = came_from[index]
+                path.reverse()
+                return path
+                
+            if closed[index]:
+                continue
+            closed[index] = 1
+            
+            # The heuristic is consistent, so an expanded cell already has its
+            # shortest g and fails this test without a closed check
+            tentative_g = g_score[index] + 1
+            for neighbor in neighbors[index]:
+                if tentative_g < g_score[neighbor]:
+                    came_from[neighbor] = index
+                    g_score[neighbor] = tentative_g
+                    heapq.heappush(frontier, ((tentative_g + heuristic[neighbor]) * span + size - tentative_g) * size + neighbor)
+                    
+        return None  # No path found
+        
+    def find_path_bidir(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+        """Find path between two cells using bidirectional A*.
+        
+        Searches forward from the start and backward from the goal at once,
+        growing whichever frontier is smaller. It stops once the best
+        meeting point found is no longer than the smallest f left on either
+        frontier, since every unexplored route must pass through both.
+        Paths are as short as find_path's, though not always the same one.
+        It can beat find_path on moderately cluttered maps, but the stopping
+        bound is loose in long corridors, so find_path stays the default.
+        
+        Args:
+            start: Starting (x, y) cell
+            goal: Target (x, y) cell
+            
+        Returns:
+            List of (x, y) cells forming the path, or None if no path exists
+        """
+        if not self.is_walkable(*start) or not self.is_walkable(*goal):
+            return None
+            
+        width = self.width
+        size = width * self.height
+        start_index = start[1] * width + start[0]
+        goal_index = goal[1] * width + goal[0]
+        if start_index == goal_index:
+            return [start]
+            
+        neighbors = self._neighbor_table()
+        
+        # Per direction (0 forward from the start, 1 backward from the goal)
+        heuristics = (self._heuristic(goal[0], goal[1]), self._heuristic(start[0], start[1]))
+        g_scores = ([size] * size, [size] * size)
+        came_froms = ([-1] * size, [-1] * size)
+        closeds = (bytearray(size), bytearray(size))
+        g_scores[0][start_index] = 0
+        g_scores[1][goal_index] = 0
+        
+        # Heap keys pack (f, size - g, index) as in find_path; key // unit is f
+        span = size + 1
+        unit = span * size
+        frontiers = (
+            [(heuristics[0][start_index] * span + size) * size + start_index],
+            [(heuristics[1][goal_index] * span + size) * size + goal_index],
+        )
+        
+        best = size  # Longer than any path
+        meet = -1
+        while frontiers[0] and frontiers[1]:
+            if best <= max(frontiers[0][0], frontiers[1][0]) // unit:
+                break
+                
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            frontier = frontiers[side]
+            heuristic = heuristics[side]
+            g_score = g_scores[side]
+            came_from = came_froms[side]
+            closed = closeds[side]
+            other_g = g_scores[1 - side]
+            
+            index = heapq.heappop(frontier) % size
+            if closed[index]:
+                continue
+            closed[index] = 1
+            
+            tentative_g = g_score[index] + 1
+            for neighbor in neighbors[index]:
+                if tentative_g < g_score[neighbor]:
+                    came_from[neighbor] = index
+                    g_score[neighbor] = tentative_g
+                    heapq.heappush(frontier, ((tentative_g + heuristic[neighbor]) * span + size - tentative_g) * size + neighbor)
+                    # Unreached cells have g = size, so this only fires where the searches meet
+                    if tentative_g + other_g[neighbor] < best:
+                        best = tentative_g + other_g[neighbor]
+                        meet = neighbor
+                        
+        if meet < 0:
+            return None  # No path found
+            
+        # Start to meeting cell, then on to the goal
+        cells = []
+        index = meet
+        while index != -1:
+            cells.append(index)
+            index = came_froms[0][index]
+        cells.reverse()
+        index = came_froms[1][meet]
+        while index != -1:
+            cells.append(index)
+            index = came_froms[1][index]
+        return [(index % width, index // width) for index in cells]
+        
+    def save_cache(self, cache_path: str) -> bool:
+        """Save cached paths and landmarks to a JSON file shared by all maps.
+        
+        Both are stored under this map's layout hash; entries for other
+        maps already in the file are kept.
+        
+        Args:
+            cache_path: Path of the cache file
+            
+        Returns:
+            True if the cache was saved
+        """
+        try:
+            try:
+                with open(cache_path, 'r') as f:
+                    data = json.load(f)
+            except FileNotFoundError:
+                data = {}
+                
+            entry = {
+                "paths": {",".join(map(str, key)): path for key, path in self._path_cache.items()}
+            }
+            if len(self._landmark_dist):
+                entry["landmarks"] = self._landmark_dist.tolist()
+            data[self.map_hash] = entry
+            with open(cache_path, 'w') as f:
+                json.dump(data, f)
+                
+            logger.info(f"Saved {len(self._path_cache)} paths to {cache_path}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error saving path cache: {e}")
+            return False
+            
+    def load_cache(self, cache_path: str) -> bool:
+        """Load this map's cached paths and landmarks from a file written by save_cache.
+        
+        Args:
+            cache_path: Path of the cache file
+            
+        Returns:
+            True if the file was read, even if it held no paths for this map
+        """
+        try:
+            with open(cache_path, 'r') as f:
+                data = json.load(f)
+                
+            entry = data.get(self.map_hash, {})
+            for key, path in entry.get("paths", {}).items():
+                self._path_cache[tuple(map(int, key.split(",")))] = [tuple(cell) for cell in path]
+            while len(self._path_cache) > self.PATH_CACHE_SIZE:
+                self._path_cache.popitem(last=False)
+                
+            if entry.get("landmarks"):
+                self._landmark_dist = np.ascontiguousarray(entry["landmarks"], dtype=np.int32)
+                self._heuristics.clear()
+                
+            logger.info(f"Loaded path cache from {cache_path}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error loading path cache: {e}")
+            return False
+            
+    def jps_find_path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+        """Find path between two cells using Jump Point Search.
+        
+        Gives paths as short as find_path's, but runs straight through open
+        stretches instead of queueing every cell on the way. Vertical jumps
+        probe sideways at each step, and horizontal jumps stop where a wall
+        beside them ends; only those cells become search nodes. It keeps far
+        fewer nodes queued, but find_path's tie-breaking makes plain A*
+        faster on the maps measured, open or cluttered.
+        
+        Args:
+            start: Starting (x, y) cell
+            goal: Target (x, y) cell
+            
+        Returns:
+            List of (x, y) cells forming the path, or None if no path exists
+        """
+        if not self.is_walkable(*start) or not self.is_walkable(*goal):
+            return None
+            
+        goal_x, goal_y = goal
+        came_from = {start: None}
+        g_score = {start: 0}
+        closed = set()
+        frontier = [(abs(start[0] - goal_x) + abs(start[1] - goal_y), start)]
+        
+        while frontier:
+            current = heapq.heappop(frontier)[1]
+            if current == goal:
+                return self._expand_jumps(current, came_from)
+            if current in closed:
+                continue
+            closed.add(current)
+            
+            x, y = current
+            parent = came_from[current]
+            for dx, dy in self.STEPS:
+                # Never jump straight back towards the parent
+                if parent is not None and (parent[0] - x) * dx + (parent[1] - y) * dy > 0:
+                    continue
+                if dy:
+                    jump_point = self._jump_vertical(x, y, dy, goal)
+                else:
+                    jump_point = self._jump_horizontal(x, y, dx, goal)
+                if jump_point is None or jump_point in closed:
+                    continue
+                    
+                tentative_g = g_score[current] + abs(jump_point[0] - x) + abs(jump_point[1] - y)
+                if tentative_g < g_score.get(jump_point, tentative_g + 1):
+                    came_from[jump_point] = current
+                    g_score[jump_point] = tentative_g
+                    f = tentative_g + abs(jump_point[0] - goal_x) + abs(jump_point[1] - goal_y)
+                    heapq.heappush(frontier, (f, jump_point))
+                    
+        return None  # No path found
+        
+    def _jump_horizontal(self, x: int, y: int, dx: int, goal: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """Run along a row to the next jump point.
+        
+        Args:
+            x: Starting X coordinate
+            y: Row
+            dx: Step direction, 1 or -1
+            goal: Target (x, y) cell
+            
+        Returns:
+            The jump point, or None if the run hits a wall first
+        """
+        # Work on flat indices; rows above/below are checked only if they exist
+        walkable = self._walkable
+        width = self.width
+        has_up = y > 0
+        has_down = y < self.height - 1
+        goal_index = goal[1] * width + goal[0] if goal[1] == y else -1
+        index = y * width + x
+        end = y * width + (width if dx > 0 else -1)
+        while True:
+            index += dx
+            if index == end or not walkable[index]:
+                return None
+            if index == goal_index:
+                return index - y * width, y
+            # Forced neighbor: the way up or down opens where it was blocked
+            if (has_up and walkable[index - width] and not walkable[index - width - dx]) or \
+               (has_down and walkable[index + width] and not walkable[index + width - dx]):
+                return index - y * width, y
+                
+    def _jump_vertical(self, x: int, y: int, dy: int, goal: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """Run along a column to the next jump point.
+        
+        Args:
+            x: Column
+            y: Starting Y coordinate
+            dy: Step direction, 1 or -1
+            goal: Target (x, y) cell
+            
+        Returns:
+            The jump point, or None if the run hits a wall first
+        """
+        # Step a flat index one row at a time; end is the row past the edge
+        walkable = self._walkable
+        width = self.width
+        offset = dy * width
+        end = self.height if dy > 0 else -1
+        goal_index = goal[1] * width + goal[0]
+        index = y * width + x
+        while True:
+            y += dy
+            index += offset
+            if y == end or not walkable[index]:
+                return None
+            if index == goal_index:
+                return x, y
+            # Stop wherever a sideways run would find something
+            if self._jump_horizontal(x, y, 1, goal) is not None or \
+               self._jump_horizontal(x, y, -1, goal) is not None:
+                return x, y
+                
+    @staticmethod
+    def _expand_jumps(end: Tuple[int, int], came_from: Dict) -> List[Tuple[int, int]]:
+        """Rebuild the cell-by-cell path from a chain of jump points.
+        
+        Args:
+            end: Last jump point
+            came_from: Jump point -> previous jump point
+            
+        Returns:
+            List of (x, y) cells from start to end
+        """
+        points = []
+        while end is not None:
+            points.append(end)
+            end = came_from[end]
+        points.reverse()
+        
+        path = [points[0]]
+        for (x0, y0), (x1, y1) in zip(points, points[1:]):
+            dx = (x1 > x0) - (x1 < x0)
+            dy = (y1 > y0) - (y1 < y0)
+            for step in range(1, abs(x1 - x0) + abs(y1 - y0) + 1):
+                path.append((x0 + dx * step, y0 + dy * step))
+        return path
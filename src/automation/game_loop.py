@@ -10,6 +10,7 @@ This module implements the core sense-process-actuate loop for game automation:
 import time
 import logging
 import os
+import zlib
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 
@@ -17,13 +18,46 @@ import cv2
 import numpy as np
 
 from emulator.interface import EmulatorInterface
-from utils.llm_api import query_llm
+from utils.llm_api import from_json, query_llm
 
 logger = logging.getLogger(__name__)
 
+# Values accepted in LLM actions
+ACTION_TYPES = frozenset({"press_button", "wait"})
+BUTTONS = frozenset({"up", "down", "left", "right", "a", "b", "start", "select"})
+
+# Native GBA frame size the LLM screenshot is shrunk to
+NATIVE_SIZE = (EmulatorInterface.GBA_WIDTH, EmulatorInterface.GBA_HEIGHT)
+
+def filter_actions(actions: List[Any]) -> List[Dict[str, Any]]:
+    """Keep well-formed actions from a parsed LLM response.
+    
+    An action must be a dict with a known type and a duration, and button
+    presses need a known button. Values are type-checked before the set
+    lookups so an unhashable value drops only its own entry.
+    
+    Args:
+        actions: Parsed LLM response
+        
+    Returns:
+        Valid actions, in order
+    """
+    return [
+        action for action in actions
+        if isinstance(action, dict)
+        and isinstance(action.get("action"), str)
+        and action["action"] in ACTION_TYPES
+        and "duration" in action
+        and (action["action"] != "press_button"
+             or (isinstance(action.get("button"), str) and action["button"] in BUTTONS))
+    ]
+
 class GameLoop:
     """Main automation loop for Pokemon game."""
     
+    # Seconds an unchanged screen is left alone before asking the LLM again
+    UNCHANGED_RETRY_SECONDS = 3.0
+    
     def __init__(self, rom_path: str, emulator_path: Optional[str] = None):
         """Initialize the game loop.
         
@@ -33,6 +67,10 @@ class GameLoop:
         """
         self.emulator = EmulatorInterface(rom_path, emulator_path)
         
+        # Checksum of the last frame sent to the LLM, and when it was sent
+        self._last_checksum: Optional[int] = None
+        self._last_query_time = 0.0
+        
     def start(self):
         """Start the automation loop."""
         logger.info("Starting automation loop...")
@@ -47,6 +85,11 @@ class GameLoop:
                     # Get current screen state
                     screen = self.emulator.get_screen_state()
                     
+                    # Skip the screenshot write and LLM call while nothing changes
+                    if not self._should_process(screen):
+                        time.sleep(0.1)
+                        continue
+                        
                     # Process screen with LLM
                     actions = self.process_state(screen)
                     
@@ -68,6 +111,29 @@ class GameLoop:
             # Clean up
             self.emulator.stop()
             
+    def _should_process(self, screen: np.ndarray) -> bool:
+        """Check whether a frame needs a new LLM decision.
+        
+        A frame identical to the last one processed is skipped, unless it has
+        stayed unchanged for UNCHANGED_RETRY_SECONDS (e.g. the last actions
+        had no visible effect).
+        
+        Args:
+            screen: Screenshot of current game state
+            
+        Returns:
+            True if the frame should be processed
+        """
+        # CRC32 reads the pixel buffer directly, far cheaper than encoding it
+        checksum = zlib.crc32(np.ascontiguousarray(screen))
+        now = time.monotonic()
+        if checksum == self._last_checksum and now - self._last_query_time < self.UNCHANGED_RETRY_SECONDS:
+            return False
+            
+        self._last_checksum = checksum
+        self._last_query_time = now
+        return True
+        
     def process_state(self, screen: np.ndarray) -> List[Dict[str, Any]]:
         """Process the current game state and determine actions.
         
@@ -77,6 +143,11 @@ class GameLoop:
         Returns:
             List of actions to execute
         """
+        # The emulator upscales a native GBA frame; shrinking it back loses no
+        # detail and cuts the encoded bytes and image tokens sent to the LLM
+        if screen.shape[1] > NATIVE_SIZE[0] or screen.shape[0] > NATIVE_SIZE[1]:
+            screen = cv2.resize(screen, NATIVE_SIZE, interpolation=cv2.INTER_AREA)
+            
         # Save screenshot for LLM
         os.makedirs("screenshots", exist_ok=True)
         timestamp = int(time.time())
@@ -88,8 +159,8 @@ class GameLoop:
         Analyze this Pokemon game screenshot and determine the next actions.
         The screenshot shows the current game state.
         
-        You must respond with a valid Python list of dictionaries containing actions.
-        Each action should be a dictionary with the following keys:
+        You must respond with a valid JSON list of objects containing actions.
+        Each action should be an object with the following keys:
         - "action": either "press_button" or "wait"
         - "button": (for press_button only) one of: "up", "down", "left", "right", "a", "b", "start", "select"
         - "duration": time in seconds (float)
@@ -97,42 +168,21 @@ class GameLoop:
         Example response:
         [{"action": "press_button", "button": "a", "duration": 0.1}, {"action": "wait", "duration": 1.0}]
         
-        Respond with ONLY the Python list, no other text.
+        Respond with ONLY the JSON list, no other text.
         """
         
         try:
             response = query_llm(prompt, provider="openai", image_path=screenshot_path)
-            # Clean up response to ensure it's valid Python
+            # Clean up response to ensure it's a JSON list
             response = response.strip()
             if not response.startswith("[") or not response.endswith("]"):
                 logger.error("Invalid response format from LLM")
                 return []
             
             # Parse response
-            actions = eval(response)  # Convert string response to list
-            
-            # Validate actions
-            valid_actions = []
-            for action in actions:
-                if not isinstance(action, dict):
-                    continue
-                
-                action_type = action.get("action")
-                if action_type not in ["press_button", "wait"]:
-                    continue
-                
-                if action_type == "press_button":
-                    if "button" not in action:
-                        continue
-                    if action["button"] not in ["up", "down", "left", "right", "a", "b", "start", "select"]:
-                        continue
-                    
-                if "duration" not in action:
-                    continue
-                
-                valid_actions.append(action)
+            actions = from_json(response)
             
-            return valid_actions
+            return filter_actions(actions)
         
         except Exception as e:
             logger.error(f"Error processing state with LLM: {e}")
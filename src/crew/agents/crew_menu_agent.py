@@ -5,7 +5,9 @@ This module provides a CrewAI wrapper around the existing menu agent,
 integrating it into the CrewAI task pipeline while preserving its core functionality.
 """
 
-from typing import Dict, Any, Optional, List, Union
+import heapq
+import itertools
+from typing import Dict, Any, Optional, List, Tuple, Union
 from dataclasses import dataclass, field
 from enum import Enum, auto
 from crewai import Agent
@@ -65,7 +67,10 @@ class CrewMenuAgent(Agent):
         
         # Initialize menu state
         self.current_request = None
-        self.request_queue: List[MenuRequest] = []
+        # Heap of (-priority, arrival order, request): highest priority first,
+        # first come first served within a priority
+        self.request_queue: List[Tuple[int, int, MenuRequest]] = []
+        self._request_order = itertools.count()
         self.menu_context: Dict[str, Any] = {}
         
         logger.info(f"Initialized {name} with {llm_provider} provider")
@@ -76,14 +81,7 @@ class CrewMenuAgent(Agent):
         Args:
             request: Menu interaction request
         """
-        # Insert request in priority order
-        insert_idx = 0
-        for idx, existing in enumerate(self.request_queue):
-            if request.priority > existing.priority:
-                break
-            insert_idx = idx + 1
-            
-        self.request_queue.insert(insert_idx, request)
+        heapq.heappush(self.request_queue, (-request.priority, next(self._request_order), request))
         logger.info(f"Added menu request: {request.action.name} - {request.target}")
         
     def clear_requests(self) -> None:
@@ -112,7 +110,7 @@ class CrewMenuAgent(Agent):
             
         # If we have requests in queue, we need menu interaction
         if self.request_queue:
-            self.current_request = self.request_queue.pop(0)
+            self.current_request = heapq.heappop(self.request_queue)[2]
             return True
             
         return False
@@ -5,7 +5,9 @@ This module provides a CrewAI wrapper around the existing navigation agent,
 integrating it into the CrewAI task pipeline while preserving its core functionality.
 """
 
-from typing import Dict, Any, Optional, List
+import heapq
+import itertools
+from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass
 from crewai import Agent
 from utils.logger import get_logger
@@ -58,7 +60,13 @@ class CrewNavigationAgent(Agent):
         
         # Initialize navigation state
         self.current_target = None
-        self.target_queue: List[NavigationTarget] = []
+        # Heap of (-priority, arrival order, target): highest priority first,
+        # first come first served within a priority
+        self.target_queue: List[Tuple[int, int, NavigationTarget]] = []
+        self._target_order = itertools.count()
+        
+        # Position last handed to the core agent, as (map ID, x, y)
+        self._last_position: Optional[Tuple[str, int, int]] = None
         
         logger.info(f"Initialized {name} with mode: {mode}")
         
@@ -76,14 +84,7 @@ class CrewNavigationAgent(Agent):
         Args:
             target: Target location to navigate to
         """
-        # Insert target in priority order
-        insert_idx = 0
-        for idx, existing in enumerate(self.target_queue):
-            if target.priority > existing.priority:
-                break
-            insert_idx = idx + 1
-            
-        self.target_queue.insert(insert_idx, target)
+        heapq.heappush(self.target_queue, (-target.priority, next(self._target_order), target))
         logger.info(f"Added navigation target: {target.name} (priority: {target.priority})")
         
     def clear_targets(self) -> None:
@@ -112,7 +113,7 @@ class CrewNavigationAgent(Agent):
         # If we have targets in queue, we need navigation
         if self.target_queue:
             # Set the next target
-            self.current_target = self.target_queue.pop(0)
+            self.current_target = heapq.heappop(self.target_queue)[2]
             # Update core agent target
             self.core_agent.target_x = self.current_target.x
             self.core_agent.target_y = self.current_target.y
@@ -134,15 +135,19 @@ class CrewNavigationAgent(Agent):
             if not self.analyze_state(state):
                 return False
                 
-            # Update current location in core agent
+            # Update current location in core agent, only once the player has
+            # moved: registering it locks and scans the shared map data
             if state.map_id and state.player:
-                current_loc = MapLocation(
-                    name="current",
-                    x=state.player.x_position,
-                    y=state.player.y_position,
-                    map_id=state.map_id
-                )
-                self.core_agent.set_current_location(current_loc)
+                position = (state.map_id, state.player.x_position, state.player.y_position)
+                if position != self._last_position:
+                    current_loc = MapLocation(
+                        name="current",
+                        x=position[1],
+                        y=position[2],
+                        map_id=position[0]
+                    )
+                    self.core_agent.set_current_location(current_loc)
+                    self._last_position = position
                 
             # Let core agent handle navigation
             action = self.core_agent.analyze_state(state)
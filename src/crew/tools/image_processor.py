@@ -9,7 +9,6 @@ import os
 import cv2
 import numpy as np
 import pytesseract
-from PIL import Image
 from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass, field
 from utils.logger import get_logger
@@ -86,12 +85,14 @@ class ImageProcessorTool:
                 x, y, w, h = region
                 img = img[y:y+h, x:x+w]
                 
-            # Convert to PIL Image for Tesseract
-            pil_img = Image.fromarray(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+            # Tesseract accepts numpy arrays; grayscale skips the PIL conversion
+            if img.ndim == 3:
+                code = cv2.COLOR_BGRA2GRAY if img.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+                img = cv2.cvtColor(img, code)
             
             # Extract text with confidence check
             result = pytesseract.image_to_data(
-                pil_img,
+                img,
                 lang=self.config.ocr_lang,
                 output_type=pytesseract.Output.DICT
             )
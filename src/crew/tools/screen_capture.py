@@ -141,7 +141,7 @@ class ScreenCaptureTool:
                 if file_age > max_age_seconds:
                     try:
                         os.remove(filepath)
-                        logger.debug(f"Removed old screenshot: {filename}")
+                        logger.debug("Removed old screenshot: %s", filename)
                     except Exception as e:
                         logger.warning(f"Could not remove {filename}: {e}")
                         
@@ -4,10 +4,12 @@ Game State Module
 This module defines classes for representing the game state.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Optional, Dict, Any, List
 
+import numpy as np
+
 class GameMode(Enum):
     """Enum for different game modes/states."""
     UNKNOWN = "unknown"
@@ -35,10 +37,43 @@ class Player:
     x_position: int = 0
     y_position: int = 0
     party: List[Pokemon] = None
+    # Party HP as arrays, kept in step with party by sync_party
+    party_hp: np.ndarray = field(default=None, repr=False, compare=False)
+    party_max_hp: np.ndarray = field(default=None, repr=False, compare=False)
     
     def __post_init__(self):
         if self.party is None:
             self.party = []
+        self.sync_party()
+    
+    def sync_party(self) -> None:
+        """Rebuild the party HP arrays; call after changing party."""
+        hp = []
+        max_hp = []
+        for member in self.party:
+            # Party entries read straight from memory are plain dicts
+            if isinstance(member, dict):
+                hp.append(member.get("hp", 0))
+                max_hp.append(member.get("max_hp", 0))
+            else:
+                hp.append(member.hp)
+                max_hp.append(member.max_hp)
+        # int32 so hp * 100 can't overflow in has_healthy_pokemon
+        self.party_hp = np.array(hp, dtype=np.int32)
+        self.party_max_hp = np.array(max_hp, dtype=np.int32)
+    
+    def has_healthy_pokemon(self, threshold_pct: int) -> bool:
+        """Check if any party member is above an HP percentage.
+        
+        Args:
+            threshold_pct: HP percentage (0-100) a member must exceed
+            
+        Returns:
+            True if at least one party member qualifies
+        """
+        # Integer cross-multiplication instead of dividing hp by max_hp
+        hp = self.party_hp
+        return bool(np.any((hp > 0) & (hp * 100 > self.party_max_hp * threshold_pct)))
 
 @dataclass
 class BattleState:
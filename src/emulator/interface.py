@@ -2,31 +2,161 @@
 Interface for controlling the mGBA emulator
 """
 
+import logging
 import os
 import platform
 import subprocess
+import threading
 import time
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Callable, Sequence
+import cv2
+import mss
 import numpy as np
 
 from utils.logger import get_logger
-from utils.input_handler import InputHandler
-from utils.screenshot import capture_window, crop_to_ratio
+from utils.input_handler import InputHandler, FRAME_DURATION
+from utils.screenshot import query_window_bounds, crop_to_ratio
 from emulator.memory_reader import MemoryReader
 from emulator.memory_map import GameVersion
 
 logger = get_logger("pokemon_player")
 
+# Emulator keyboard binding for each GBA button
+BUTTON_KEYS = {
+    'a': 'x',
+    'b': 'z',
+    'up': 'up',
+    'down': 'down',
+    'left': 'left',
+    'right': 'right',
+    'start': 'enter',
+    'select': 'backspace',
+    'l': 'a',
+    'r': 's',
+}
+# Accept upper-case names too, so lookups need no str.lower() per press
+BUTTON_KEYS.update({button.upper(): key for button, key in BUTTON_KEYS.items()})
+
+class CaptureThread(threading.Thread):
+    """Background producer that keeps a small ring of frames filled.
+    
+    The thread grabs into pre-allocated buffers while the agent works on
+    the previous frame, so capture latency overlaps with analysis. It
+    idles once it is a full ring ahead of the consumer.
+    """
+    
+    def __init__(self, get_monitor: Callable[[], Dict[str, int]], num_buffers: int = 3):
+        """Initialize capture thread.
+        
+        Args:
+            get_monitor: Callable taking this thread's mss handle and
+                returning the mss monitor dict to grab
+            num_buffers: Number of frames in the ring (at least 2)
+        """
+        super().__init__(name="CaptureThread", daemon=True)
+        self.get_monitor = get_monitor
+        self.num_buffers = max(2, num_buffers)
+        self.buffers: List[Optional[np.ndarray]] = [None] * self.num_buffers
+        
+        # Sequence number of the newest complete frame and the last one handed out
+        self.seq = -1
+        self.consumed = -1
+        
+        self._running = True
+        self._frame_ready = threading.Event()
+        self._space_free = threading.Event()
+        self._space_free.set()
+        
+    def run(self):
+        """Fill ring buffers until stopped."""
+        # mss handles are bound to the thread that created them
+        sct = mss.mss()
+        try:
+            while self._running:
+                # Never overwrite the frame the consumer is still holding
+                if self.seq - self.consumed >= self.num_buffers - 1:
+                    self._space_free.clear()
+                    self._space_free.wait(timeout=0.1)
+                    continue
+                    
+                try:
+                    shot = sct.grab(self.get_monitor(sct))
+                except Exception as e:
+                    logger.error(f"Error capturing frame: {e}")
+                    time.sleep(0.1)
+                    continue
+                    
+                frame = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+                idx = (self.seq + 1) % self.num_buffers
+                buf = self.buffers[idx]
+                if buf is None or buf.shape != frame.shape:
+                    buf = self.buffers[idx] = np.empty(frame.shape, dtype=np.uint8)
+                np.copyto(buf, frame)
+                
+                # Publish only after the buffer is fully written
+                self.seq += 1
+                self._frame_ready.set()
+        finally:
+            sct.close()
+            
+    def latest(self, timeout: float = 1.0) -> Optional[np.ndarray]:
+        """Get the newest complete frame.
+        
+        Args:
+            timeout: How long to wait for the first frame
+            
+        Returns:
+            Newest frame (invalidated by the next call), or None on timeout
+        """
+        if not self._frame_ready.wait(timeout):
+            return None
+            
+        seq = self.seq
+        self.consumed = seq
+        self._space_free.set()
+        return self.buffers[seq % self.num_buffers]
+        
+    def stop(self):
+        """Stop the thread and wait for it to exit."""
+        self._running = False
+        self._space_free.set()
+        self.join(timeout=1.0)
+
 class EmulatorInterface:
     """Interface for controlling mGBA emulator"""
     
-    def __init__(self, rom_path: str, emulator_path: Optional[str] = None, version: GameVersion = GameVersion.EMERALD):
+    # How long a window geometry lookup stays valid, in seconds
+    WINDOW_CACHE_TTL = 0.5
+    
+    # Native GBA framebuffer size
+    GBA_WIDTH = 240
+    GBA_HEIGHT = 160
+    
+    # Height of the macOS window title bar included in the window bounds
+    TITLE_BAR_HEIGHT = 28
+    
+    # Emulator startup polling: give up after STARTUP_TIMEOUT seconds
+    STARTUP_TIMEOUT = 10.0
+    STARTUP_POLL_INTERVAL = 0.05
+    
+    # Where the window cannot be queried, how long the process must survive
+    STARTUP_GRACE = 0.5
+    
+    # How long stop() waits after terminate before killing the process
+    STOP_TIMEOUT = 0.5
+    
+    # How long a process liveness check stays valid, in seconds
+    RUNNING_CACHE_TTL = 0.2
+    
+    def __init__(self, rom_path: str, emulator_path: Optional[str] = None, version: GameVersion = GameVersion.EMERALD,
+                 debug_output: bool = False):
         """Initialize emulator interface.
         
         Args:
             rom_path: Path to ROM file
             emulator_path: Optional path to mGBA executable
             version: Pokemon game version
+            debug_output: Forward mGBA's stdout/stderr to the debug log
         """
         self.rom_path = os.path.abspath(rom_path)
         self.is_macos = platform.system() == "Darwin"
@@ -34,6 +164,12 @@ class EmulatorInterface:
         self.process: Optional[subprocess.Popen] = None
         self.version = version
         self.memory_reader: Optional[MemoryReader] = None
+        self.debug_output = debug_output
+        self._output_thread: Optional[threading.Thread] = None
+        
+        # Cached result of process.poll(), refreshed at most every RUNNING_CACHE_TTL seconds
+        self._running_cached = False
+        self._last_poll = 0.0
         
         # Expected GBA screen dimensions (scaled)
         self.expected_width = 480
@@ -42,6 +178,29 @@ class EmulatorInterface:
         # Initialize input handler
         self.input_handler = InputHandler()
         
+        # Screen grabber, created on first capture and reused so per-frame
+        # captures skip backend setup; see _grabber
+        self._sct: "Optional[mss.base.MSSBase]" = None
+        
+        # Frame buffers reused across captures, reallocated only on resize
+        self._frame_buf: Optional[np.ndarray] = None
+        self._bgr_buf: Optional[np.ndarray] = None
+        
+        # Frame scaled down to the native GBA resolution, for perception
+        self._small_buf = np.empty((self.GBA_HEIGHT, self.GBA_WIDTH, 4), dtype=np.uint8)
+        
+        # Cached window geometry, refreshed at most every WINDOW_CACHE_TTL seconds
+        self._win_geom: Optional[Tuple[int, int, int, int]] = None
+        self._win_geom_ts = 0.0
+        # Held while reading or refreshing the cache, which the capture thread shares
+        self._win_geom_lock = threading.Lock()
+        
+        # Whether captures default to the game area inside the window
+        self._use_game_region = False
+        
+        # Optional background producer for pipelined captures
+        self._capture_thread: Optional[CaptureThread] = None
+        
         logger.info(f"Initialized EmulatorInterface with ROM: {rom_path}")
         logger.info(f"Using emulator at: {self.emulator_path}")
         
@@ -81,20 +240,35 @@ class EmulatorInterface:
         try:
             logger.info("Starting emulator...")
             
-            # Start mGBA
+            # Start mGBA; unless its output is wanted, don't let it fill a pipe
+            output = subprocess.PIPE if self.debug_output else subprocess.DEVNULL
             self.process = subprocess.Popen(
                 [self.emulator_path, self.rom_path],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
+                stdout=output,
+                stderr=subprocess.STDOUT if self.debug_output else subprocess.DEVNULL
             )
             
-            # Wait for emulator to start
-            time.sleep(2)
+            self._last_poll = 0.0
             
-            if self.process.poll() is not None:
+            # Drain the pipe continuously so the emulator never blocks on a write
+            if self.debug_output:
+                self._output_thread = threading.Thread(
+                    target=self._drain_output,
+                    args=(self.process.stdout,),
+                    name="EmulatorOutput",
+                    daemon=True
+                )
+                self._output_thread.start()
+            
+            # Wait for the emulator window instead of a fixed delay
+            if not self._wait_for_window():
                 logger.error("Failed to start emulator")
                 return False
                 
+            # Only the game screen is needed, when the window can be located
+            if self.is_macos:
+                self.calibrate_game_region()
+                
             # Initialize memory reader
             self.memory_reader = MemoryReader(self.process.pid, self.version)
             
@@ -105,6 +279,46 @@ class EmulatorInterface:
             logger.error(f"Error starting emulator: {e}")
             return False
             
+    def _drain_output(self, stream) -> None:
+        """Forward emulator output to the debug log until the pipe closes.
+        
+        Args:
+            stream: Binary stdout pipe of the emulator process
+        """
+        try:
+            for line in iter(stream.readline, b''):
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("mGBA: %s", line.decode(errors='replace').rstrip())
+        except (OSError, ValueError):
+            pass
+        finally:
+            stream.close()
+            
+    def _wait_for_window(self) -> bool:
+        """Poll until the emulator window is up.
+        
+        Returns:
+            True if the window appeared, False if the process exited or
+            STARTUP_TIMEOUT elapsed
+        """
+        started = time.perf_counter()
+        while time.perf_counter() - started < self.STARTUP_TIMEOUT:
+            if self.process.poll() is not None:
+                return False
+                
+            if self.is_macos:
+                try:
+                    query_window_bounds(self.process.pid)
+                    return True
+                except Exception:
+                    pass
+            elif time.perf_counter() - started >= self.STARTUP_GRACE:
+                return True
+                
+            time.sleep(self.STARTUP_POLL_INTERVAL)
+            
+        return False
+        
     def stop(self) -> bool:
         """Stop the emulator.
         
@@ -112,11 +326,20 @@ class EmulatorInterface:
             True if successful, False otherwise
         """
         try:
+            self.stop_capture_thread()
+            
             if self.process:
                 logger.info("Stopping emulator...")
                 self.process.terminate()
-                self.process.wait(timeout=5)
+                try:
+                    self.process.wait(timeout=self.STOP_TIMEOUT)
+                except subprocess.TimeoutExpired:
+                    logger.warning("Emulator did not exit, killing it")
+                    self.process.kill()
+                    self.process.wait()
                 self.memory_reader = None
+                self._running_cached = False
+                self._last_poll = 0.0
                 logger.info("Emulator stopped successfully")
                 return True
             return False
@@ -125,6 +348,38 @@ class EmulatorInterface:
             logger.error(f"Error stopping emulator: {e}")
             return False
             
+    def is_running(self) -> bool:
+        """Check whether the emulator process is alive.
+        
+        The poll result is cached for RUNNING_CACHE_TTL seconds so rapid
+        button presses don't each pay for a waitpid syscall.
+        
+        Returns:
+            True if the emulator process is running
+        """
+        if not self.process:
+            return False
+            
+        now = time.perf_counter()
+        if now - self._last_poll >= self.RUNNING_CACHE_TTL:
+            self._running_cached = self.process.poll() is None
+            self._last_poll = now
+        return self._running_cached
+        
+    def _check_running(self) -> bool:
+        """Check the emulator is usable before sending input.
+        
+        An emulator started outside this interface (no process handle) is
+        left to the input handler to find.
+        
+        Returns:
+            True if input can be sent
+        """
+        if self.process and not self.is_running():
+            logger.error("Emulator is not running")
+            return False
+        return True
+        
     def focus_window(self) -> bool:
         """Focus the emulator window.
         
@@ -155,6 +410,200 @@ class EmulatorInterface:
             logger.error(f"Error focusing window: {e}")
             return False
             
+    def _get_window_geometry(self, sct: "Optional[mss.base.MSSBase]" = None) -> Tuple[int, int, int, int]:
+        """Get the emulator window geometry.
+        
+        The lookup is an OS round trip (an AppleScript call on macOS that
+        does not focus the window), so the result is cached for WINDOW_CACHE_TTL seconds. Falls back to
+        the primary monitor when the window bounds cannot be queried on
+        this platform.
+        
+        Args:
+            sct: mss handle to read the monitor from; defaults to this
+                thread's own grabber. Other threads must pass theirs, since
+                mss handles are bound to the thread that created them.
+        
+        Returns:
+            Tuple of (left, top, width, height) in screen coordinates
+        """
+        with self._win_geom_lock:
+            if self._win_geom is not None and time.perf_counter() - self._win_geom_ts < self.WINDOW_CACHE_TTL:
+                return self._win_geom
+                
+            if self.is_macos and self.process:
+                geom = query_window_bounds(self.process.pid)
+            else:
+                monitor = (sct or self._grabber()).monitors[1]
+                geom = (monitor["left"], monitor["top"], monitor["width"], monitor["height"])
+                
+            # Stamp after the lookup so its own latency doesn't eat the TTL
+            self._win_geom = geom
+            self._win_geom_ts = time.perf_counter()
+            return geom
+        
+    def _grabber(self) -> "mss.base.MSSBase":
+        """Get the screen grabber, creating it on first use.
+        
+        Creating it needs a live display, so interfaces that never capture
+        can run headless.
+        
+        Returns:
+            The mss screen grabber
+        """
+        if self._sct is None:
+            self._sct = mss.mss()
+        return self._sct
+        
+    def invalidate_window_cache(self) -> None:
+        """Force the next capture to look up the window geometry again."""
+        with self._win_geom_lock:
+            self._win_geom = None
+        
+    def _get_monitor(self, region: Optional[Tuple[int, int, int, int]] = None,
+                     sct: "Optional[mss.base.MSSBase]" = None) -> Dict[str, int]:
+        """Get the mss monitor dict for the emulator window.
+        
+        Args:
+            region: Optional (x, y, width, height) relative to the window
+            sct: mss handle of the calling thread, see _get_window_geometry
+            
+        Returns:
+            Dictionary with left, top, width and height keys
+        """
+        left, top, width, height = self._get_window_geometry(sct)
+        if region is None and self._use_game_region:
+            region = self._game_region(width, height)
+            
+        if region:
+            x, y, width, height = region
+            left += x
+            top += y
+            
+        return {"left": left, "top": top, "width": width, "height": height}
+        
+    def _game_region(self, width: int, height: int) -> Tuple[int, int, int, int]:
+        """Locate the game screen inside a window of the given size.
+        
+        mGBA draws the game centered and aspect-locked below the title
+        bar, so the region follows from the window size alone.
+        
+        Args:
+            width: Window width
+            height: Window height
+            
+        Returns:
+            Tuple of (x, y, width, height) relative to the window
+        """
+        top = self.TITLE_BAR_HEIGHT if self.is_macos else 0
+        content_height = height - top
+        scale = min(width / self.GBA_WIDTH, content_height / self.GBA_HEIGHT)
+        game_width = int(self.GBA_WIDTH * scale)
+        game_height = int(self.GBA_HEIGHT * scale)
+        return (
+            (width - game_width) // 2,
+            top + (content_height - game_height) // 2,
+            game_width,
+            game_height
+        )
+        
+    def calibrate_game_region(self) -> Tuple[int, int, int, int]:
+        """Restrict default captures to the game screen.
+        
+        After calibration, capture_screen() without a region grabs only
+        the game area, skipping window chrome and letterbox bars. The
+        region tracks window resizes.
+        
+        Returns:
+            Tuple of (x, y, width, height) relative to the window
+        """
+        _, _, width, height = self._get_window_geometry()
+        region = self._game_region(width, height)
+        self._use_game_region = True
+        logger.info(f"Calibrated game region: {region}")
+        return region
+        
+    def start_capture_thread(self, num_buffers: int = 3) -> None:
+        """Start capturing frames in the background.
+        
+        While running, capture_screen() returns the newest frame from
+        the ring instead of grabbing synchronously.
+        
+        Args:
+            num_buffers: Number of frames in the ring
+        """
+        if self._capture_thread:
+            return
+            
+        # The thread resolves the monitor on its own mss handle
+        self._capture_thread = CaptureThread(lambda sct: self._get_monitor(sct=sct), num_buffers)
+        self._capture_thread.start()
+        logger.info("Started background capture thread")
+        
+    def stop_capture_thread(self) -> None:
+        """Stop the background capture thread if running."""
+        if self._capture_thread:
+            self._capture_thread.stop()
+            self._capture_thread = None
+            logger.info("Stopped background capture thread")
+        
+    def capture_screen(self, region: Optional[Tuple[int, int, int, int]] = None) -> np.ndarray:
+        """Capture the emulator window.
+        
+        Args:
+            region: Optional (x, y, width, height) relative to the window.
+                Defaults to the game area once calibrate_game_region() ran.
+            
+        Returns:
+            Numpy array (BGRA, uint8) containing the raw screenshot. The
+            array is reused by the next capture, so copy it to keep it.
+        """
+        if self._capture_thread and region is None:
+            frame = self._capture_thread.latest()
+            if frame is not None:
+                return frame
+                
+        shot = self._grabber().grab(self._get_monitor(region))
+        frame = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        
+        if self._frame_buf is None or self._frame_buf.shape != frame.shape:
+            self._frame_buf = np.empty(frame.shape, dtype=np.uint8)
+        np.copyto(self._frame_buf, frame)
+        return self._frame_buf
+        
+    def capture_native(self) -> np.ndarray:
+        """Capture the game screen scaled down to the native GBA resolution.
+        
+        The emulator draws 240x160 upscaled, so perception code can work on
+        this frame instead of the full-size one. Text that needs the full
+        resolution should be cropped from capture_screen() instead.
+        
+        Returns:
+            Numpy array (BGRA, uint8) of GBA_HEIGHT x GBA_WIDTH. The array is
+            reused by the next call, so copy it to keep it.
+        """
+        frame = self.capture_screen()
+        if not self._use_game_region:
+            frame = crop_to_ratio(frame, self.GBA_WIDTH, self.GBA_HEIGHT)
+            
+        cv2.resize(frame, (self.GBA_WIDTH, self.GBA_HEIGHT), dst=self._small_buf,
+                   interpolation=cv2.INTER_AREA)
+        return self._small_buf
+        
+    def capture_screen_pil(self, region: Optional[Tuple[int, int, int, int]] = None):
+        """Capture the emulator window as a PIL image.
+        
+        Prefer capture_screen(); this is only for callers that need PIL.
+        
+        Args:
+            region: Optional (x, y, width, height) relative to the window
+            
+        Returns:
+            PIL.Image.Image in RGB mode
+        """
+        from PIL import Image
+        
+        return Image.fromarray(cv2.cvtColor(self.capture_screen(region), cv2.COLOR_BGRA2RGB))
+        
     def get_screen_state(self) -> np.ndarray:
         """Get current screen state.
         
@@ -163,7 +612,10 @@ class EmulatorInterface:
         """
         try:
             # Capture window screenshot
-            screenshot = capture_window(pid=self.process.pid if self.process else None)
+            frame = self.capture_screen()
+            if self._bgr_buf is None or self._bgr_buf.shape[:2] != frame.shape[:2]:
+                self._bgr_buf = np.empty(frame.shape[:2] + (3,), dtype=np.uint8)
+            screenshot = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR, dst=self._bgr_buf)
             
             # Crop to GBA aspect ratio
             processed = crop_to_ratio(screenshot, self.expected_width, self.expected_height)
@@ -206,23 +658,66 @@ class EmulatorInterface:
             logger.error(f"Error getting party data: {e}")
             return {"count": 0, "pokemon": []}
             
-    def press_button(self, button: str, duration: float = 0.1):
+    def press_button(self, button: str, duration: float = FRAME_DURATION, settle: float = 0.0):
         """Press a button.
         
         Args:
             button: Button to press
             duration: How long to hold the button
+            settle: Optional pause after release, for slow menus
         """
-        self.input_handler.press_button(button, duration)
+        if not self._check_running():
+            return
+            
+        key = BUTTON_KEYS.get(button)
+        if key is None:
+            logger.error(f"Unknown button: {button}")
+            return
+            
+        self.input_handler.press_button(key, duration, settle)
         
-    def press_buttons(self, buttons: List[str], duration: float = 0.1):
+    def press_buttons(self, buttons: List[str], duration: float = FRAME_DURATION, settle: float = 0.0):
         """Press multiple buttons simultaneously.
         
         Args:
             buttons: List of buttons to press
             duration: How long to hold the buttons
+            settle: Optional pause after release, for slow menus
         """
-        self.input_handler.press_buttons(buttons, duration)
+        if not self._check_running():
+            return
+            
+        keys = []
+        for button in buttons:
+            key = BUTTON_KEYS.get(button)
+            if key is None:
+                logger.error(f"Unknown button: {button}")
+                return
+            keys.append(key)
+            
+        self.input_handler.press_buttons(keys, duration, settle)
+        
+    def press_sequence(self, buttons: Sequence[str], duration: float = FRAME_DURATION,
+                       delay: float = FRAME_DURATION):
+        """Press buttons one after another in a single batch.
+        
+        Args:
+            buttons: Buttons to press, in order
+            duration: How long to hold each button
+            delay: Gap between consecutive presses
+        """
+        if not self._check_running():
+            return
+            
+        sequence = []
+        for button in buttons:
+            key = BUTTON_KEYS.get(button)
+            if key is None:
+                logger.error(f"Unknown button: {button}")
+                return
+            sequence.append((key, duration))
+            
+        self.input_handler.press_sequence(sequence, delay)
             
     @property
     def pid(self) -> Optional[int]:
@@ -0,0 +1,282 @@
+"""
+Low-level keyboard event backends for driving the emulator
+
+Each backend talks to the platform input API directly (Quartz on macOS,
+SendInput on Windows, XTest on X11) so a key event costs a single native
+call instead of a trip through a generic automation library.
+"""
+
+from abc import ABC, abstractmethod
+import atexit
+import ctypes
+import ctypes.util
+import platform
+from typing import Dict, List, Optional
+
+from utils.logger import get_logger
+
+# Get logger for this module
+logger = get_logger("pokemon_player")
+
+SYSTEM = platform.system()
+
+# Import Quartz on macOS
+if SYSTEM == "Darwin":
+    from Quartz import (
+        CGEventCreateKeyboardEvent,
+        CGEventPostToPid
+    )
+
+# Virtual key codes for macOS
+MAC_KEY_CODES = {
+    'up': 126,    # Up arrow
+    'down': 125,  # Down arrow
+    'left': 123,  # Left arrow
+    'right': 124, # Right arrow
+    'x': 7,       # X key (for A button)
+    'z': 6,       # Z key (for B button)
+    'a': 0,       # A key (for L button)
+    's': 1,       # S key (for R button)
+    'enter': 36,  # Enter/Return (for Start)
+    'backspace': 51, # Delete/Backspace (for Select)
+}
+
+# Virtual key codes for Windows
+WIN_KEY_CODES = {
+    'up': 0x26,
+    'down': 0x28,
+    'left': 0x25,
+    'right': 0x27,
+    'x': 0x58,
+    'z': 0x5A,
+    'a': 0x41,
+    's': 0x53,
+    'enter': 0x0D,
+    'backspace': 0x08,
+}
+
+# X11 keysyms, resolved to keycodes once the display is open
+X11_KEYSYMS = {
+    'up': 0xFF52,
+    'down': 0xFF54,
+    'left': 0xFF51,
+    'right': 0xFF53,
+    'x': 0x0078,
+    'z': 0x007A,
+    'a': 0x0061,
+    's': 0x0073,
+    'enter': 0xFF0D,
+    'backspace': 0xFF08,
+}
+
+class KeyBackend(ABC):
+    """Base class for platform keyboard backends"""
+
+    # Whether key events must be addressed to the emulator process
+    requires_pid = False
+
+    def __init__(self):
+        """Initialize backend"""
+        self.pid: Optional[int] = None
+
+    @abstractmethod
+    def resolve_keys(self) -> Dict[str, int]:
+        """Resolve key names to platform key codes.
+
+        Returns:
+            Dictionary mapping key name to key code
+        """
+        pass
+
+    @abstractmethod
+    def key_down(self, code: int) -> None:
+        """Send a key press event.
+
+        Args:
+            code: Platform key code
+        """
+        pass
+
+    @abstractmethod
+    def key_up(self, code: int) -> None:
+        """Send a key release event.
+
+        Args:
+            code: Platform key code
+        """
+        pass
+
+    def keys_down(self, codes: List[int]) -> None:
+        """Press several keys as one batch.
+
+        Args:
+            codes: Platform key codes
+        """
+        for code in codes:
+            self.key_down(code)
+
+    def keys_up(self, codes: List[int]) -> None:
+        """Release several keys as one batch.
+
+        Args:
+            codes: Platform key codes
+        """
+        for code in codes:
+            self.key_up(code)
+
+class QuartzBackend(KeyBackend):
+    """Posts key events to the emulator process via Quartz (macOS)"""
+
+    requires_pid = True
+
+    def resolve_keys(self) -> Dict[str, int]:
+        return dict(MAC_KEY_CODES)
+
+    def key_down(self, code: int) -> None:
+        CGEventPostToPid(self.pid, CGEventCreateKeyboardEvent(None, code, True))
+
+    def key_up(self, code: int) -> None:
+        CGEventPostToPid(self.pid, CGEventCreateKeyboardEvent(None, code, False))
+
+if SYSTEM == "Windows":
+    ULONG_PTR = ctypes.c_size_t
+
+    INPUT_KEYBOARD = 1
+    KEYEVENTF_KEYUP = 0x0002
+
+    class MOUSEINPUT(ctypes.Structure):
+        _fields_ = [
+            ("dx", ctypes.c_long),
+            ("dy", ctypes.c_long),
+            ("mouseData", ctypes.c_ulong),
+            ("dwFlags", ctypes.c_ulong),
+            ("time", ctypes.c_ulong),
+            ("dwExtraInfo", ULONG_PTR),
+        ]
+
+    class KEYBDINPUT(ctypes.Structure):
+        _fields_ = [
+            ("wVk", ctypes.c_ushort),
+            ("wScan", ctypes.c_ushort),
+            ("dwFlags", ctypes.c_ulong),
+            ("time", ctypes.c_ulong),
+            ("dwExtraInfo", ULONG_PTR),
+        ]
+
+    class HARDWAREINPUT(ctypes.Structure):
+        _fields_ = [
+            ("uMsg", ctypes.c_ulong),
+            ("wParamL", ctypes.c_ushort),
+            ("wParamH", ctypes.c_ushort),
+        ]
+
+    class _INPUTUNION(ctypes.Union):
+        _fields_ = [("mi", MOUSEINPUT), ("ki", KEYBDINPUT), ("hi", HARDWAREINPUT)]
+
+    class INPUT(ctypes.Structure):
+        _fields_ = [("type", ctypes.c_ulong), ("union", _INPUTUNION)]
+
+class SendInputBackend(KeyBackend):
+    """Injects key events with user32.SendInput (Windows)"""
+
+    def __init__(self):
+        super().__init__()
+        self._user32 = ctypes.windll.user32
+
+        # Raise the system timer resolution to 1 ms so key hold durations
+        # aren't rounded up to the default ~15.6 ms tick
+        winmm = ctypes.windll.winmm
+        winmm.timeBeginPeriod(1)
+        atexit.register(winmm.timeEndPeriod, 1)
+
+    def resolve_keys(self) -> Dict[str, int]:
+        return dict(WIN_KEY_CODES)
+
+    def _send(self, codes: List[int], flags: int) -> None:
+        # One SendInput call queues every event atomically
+        inputs = (INPUT * len(codes))()
+        for inp, code in zip(inputs, codes):
+            inp.type = INPUT_KEYBOARD
+            inp.union.ki = KEYBDINPUT(wVk=code, dwFlags=flags)
+        self._user32.SendInput(len(codes), inputs, ctypes.sizeof(INPUT))
+
+    def key_down(self, code: int) -> None:
+        self._send([code], 0)
+
+    def key_up(self, code: int) -> None:
+        self._send([code], KEYEVENTF_KEYUP)
+
+    def keys_down(self, codes: List[int]) -> None:
+        self._send(codes, 0)
+
+    def keys_up(self, codes: List[int]) -> None:
+        self._send(codes, KEYEVENTF_KEYUP)
+
+class XTestBackend(KeyBackend):
+    """Injects key events with the XTest extension (X11)"""
+
+    def __init__(self):
+        super().__init__()
+        xlib_path = ctypes.util.find_library("X11")
+        xtst_path = ctypes.util.find_library("Xtst")
+        if not xlib_path or not xtst_path:
+            raise OSError("X11/XTest libraries not found")
+        self._xlib = ctypes.cdll.LoadLibrary(xlib_path)
+        self._xtst = ctypes.cdll.LoadLibrary(xtst_path)
+
+        self._xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        self._xlib.XOpenDisplay.restype = ctypes.c_void_p
+        self._xlib.XKeysymToKeycode.argtypes = [ctypes.c_void_p, ctypes.c_ulong]
+        self._xlib.XKeysymToKeycode.restype = ctypes.c_ubyte
+        self._xlib.XFlush.argtypes = [ctypes.c_void_p]
+        self._xlib.XGrabServer.argtypes = [ctypes.c_void_p]
+        self._xlib.XUngrabServer.argtypes = [ctypes.c_void_p]
+        self._xtst.XTestFakeKeyEvent.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_ulong]
+
+        # Key releases may be sent from timer threads
+        self._xlib.XInitThreads()
+        self._display = self._xlib.XOpenDisplay(None)
+        if not self._display:
+            raise OSError("Could not open X display")
+
+    def resolve_keys(self) -> Dict[str, int]:
+        return {
+            name: self._xlib.XKeysymToKeycode(self._display, keysym)
+            for name, keysym in X11_KEYSYMS.items()
+        }
+
+    def key_down(self, code: int) -> None:
+        self._xtst.XTestFakeKeyEvent(self._display, code, True, 0)
+        self._xlib.XFlush(self._display)
+
+    def key_up(self, code: int) -> None:
+        self._xtst.XTestFakeKeyEvent(self._display, code, False, 0)
+        self._xlib.XFlush(self._display)
+
+    def _send_batch(self, codes: List[int], is_press: bool) -> None:
+        # Hold the server so the events are processed as one burst
+        self._xlib.XGrabServer(self._display)
+        try:
+            for code in codes:
+                self._xtst.XTestFakeKeyEvent(self._display, code, is_press, 0)
+        finally:
+            self._xlib.XUngrabServer(self._display)
+            self._xlib.XFlush(self._display)
+
+    def keys_down(self, codes: List[int]) -> None:
+        self._send_batch(codes, True)
+
+    def keys_up(self, codes: List[int]) -> None:
+        self._send_batch(codes, False)
+
+def create_backend() -> KeyBackend:
+    """Create the keyboard backend for the current platform.
+
+    Returns:
+        KeyBackend instance
+    """
+    if SYSTEM == "Darwin":
+        return QuartzBackend()
+    if SYSTEM == "Windows":
+        return SendInputBackend()
+    return XTestBackend()
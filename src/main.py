@@ -137,6 +137,7 @@ def main():
             logger.info("Received interrupt signal")
             
         finally:
+            agent_manager.shutdown()
             cleanup(emulator)
             
     except Exception as e:
@@ -2,16 +2,21 @@
 Tests for the pathfinding module.
 """
 
+import tempfile
 import unittest
+from unittest.mock import Mock
 from pathlib import Path
 import sys
 
+import numpy as np
+
 # Add src directory to Python path
 src_dir = Path(__file__).resolve().parent.parent
 sys.path.append(str(src_dir))
 
-from ai.pathfinding import PathFinder
-from ai.navigation_agent import MapLocation
+from ai.pathfinding import GridPathFinder, PathFinder
+from ai._pathfinding_kernels import astar_grid, trace_path
+from ai.navigation_agent import MapLocation, MapRegistry, NavigationAgent
 
 class TestPathFinder(unittest.TestCase):
     def setUp(self):
@@ -54,6 +59,18 @@ class TestPathFinder(unittest.TestCase):
         self.assertIn(self.loc_b, neighbors)
         self.assertIn(self.loc_c, neighbors)
 
+    def test_get_neighbors_skips_distant_and_includes_connected_maps(self):
+        """Test neighbors are adjacent tiles plus connected locations on other maps."""
+        far = MapLocation("F", 3, 0, "map1")
+        door = MapLocation("B", 5, 5, "map2")
+        self.pathfinder.add_location(far)
+        self.pathfinder.add_location(door)
+        
+        neighbors = self.pathfinder.get_neighbors(self.loc_a)
+        self.assertNotIn(far, neighbors)
+        self.assertIn(door, neighbors)
+        self.assertEqual(len(neighbors), 3)
+
     def test_find_path_same_location(self):
         """Test finding path when start equals goal."""
         path = self.pathfinder.find_path(self.loc_a, self.loc_a)
@@ -90,6 +107,29 @@ class TestPathFinder(unittest.TestCase):
         self.assertEqual(path[0], self.loc_a)
         self.assertEqual(path[-1], loc_y)
 
+    def test_find_path_cache(self):
+        """Test repeated queries reuse the path until a location is added."""
+        path = self.pathfinder.find_path(self.loc_a, self.loc_d)
+        path.clear()  # Callers get their own copy
+        self.assertEqual(len(self.pathfinder.find_path(self.loc_a, self.loc_d)), 3)
+        self.assertEqual(len(self.pathfinder._path_cache), 1)
+        
+        self.pathfinder.add_location(MapLocation("E", 2, 0, "map1"))
+        self.assertEqual(len(self.pathfinder._path_cache), 0)
+
+    def test_find_path_iter(self):
+        """Test a search spread over several calls matches find_path."""
+        calls = 0
+        done = False
+        while not done:
+            done, path = self.pathfinder.find_path_iter(self.loc_a, self.loc_d, max_iters=1)
+            calls += 1
+        self.assertGreater(calls, 1)
+        self.assertEqual(path, self.pathfinder.find_path(self.loc_a, self.loc_d))
+        
+        # Finished searches are served from the cache
+        self.assertEqual(self.pathfinder.find_path_iter(self.loc_a, self.loc_d), (True, path))
+
     def test_get_next_move(self):
         """Test getting next movement action."""
         # Move right
@@ -109,5 +149,159 @@ class TestPathFinder(unittest.TestCase):
         move = self.pathfinder.get_next_move(self.loc_a, unreachable)
         self.assertIsNone(move)
 
+class TestGridPathFinder(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures."""
+        # A wall down column 1 with a gap at the bottom row
+        self.collision_map = np.array([
+            [0, 1, 0],
+            [0, 1, 0],
+            [0, 0, 0],
+        ])
+        self.pathfinder = GridPathFinder(self.collision_map)
+
+    def test_find_path_around_wall(self):
+        """Test the path routes through the gap in the wall."""
+        path = self.pathfinder.find_path((0, 0), (2, 0))
+        self.assertEqual(path, [(0, 0), (0, 1), (0, 2), (1, 2), (2, 2), (2, 1), (2, 0)])
+
+    def test_jps_find_path_matches_a_star(self):
+        """Test Jump Point Search finds an equally short, connected path."""
+        path = self.pathfinder.jps_find_path((0, 0), (2, 0))
+        self.assertEqual(len(path), len(self.pathfinder.find_path((0, 0), (2, 0))))
+        self.assertEqual(path[0], (0, 0))
+        self.assertEqual(path[-1], (2, 0))
+        for (x0, y0), (x1, y1) in zip(path, path[1:]):
+            self.assertEqual(abs(x1 - x0) + abs(y1 - y0), 1)
+            self.assertEqual(self.collision_map[y1, x1], 0)
+        
+        self.assertIsNone(self.pathfinder.jps_find_path((0, 0), (1, 0)))
+
+    def test_find_path_bidir_matches_a_star(self):
+        """Test bidirectional A* finds an equally short, connected path."""
+        # Two walls forcing a zig-zag
+        collision_map = np.zeros((6, 6), dtype=int)
+        collision_map[1, :5] = 1
+        collision_map[4, 1:] = 1
+        pathfinder = GridPathFinder(collision_map)
+        
+        path = pathfinder.find_path_bidir((0, 0), (0, 5))
+        self.assertEqual(len(path), len(pathfinder.find_path((0, 0), (0, 5))))
+        self.assertEqual(path[0], (0, 0))
+        self.assertEqual(path[-1], (0, 5))
+        for (x0, y0), (x1, y1) in zip(path, path[1:]):
+            self.assertEqual(abs(x1 - x0) + abs(y1 - y0), 1)
+            self.assertEqual(collision_map[y1, x1], 0)
+        
+        self.assertEqual(pathfinder.find_path_bidir((0, 0), (0, 0)), [(0, 0)])
+        self.assertIsNone(self.pathfinder.find_path_bidir((0, 0), (1, 0)))
+        self.assertIsNone(GridPathFinder(np.array([[0, 1, 0]])).find_path_bidir((0, 0), (2, 0)))
+
+    def test_astar_grid_kernel(self):
+        """Test the kernel's predecessor chain traces the wall-avoiding path."""
+        walkable = (self.collision_map == 0).ravel().astype(np.uint8)
+        no_landmarks = np.empty((0, 3), dtype=np.int32)
+        came_from = astar_grid(walkable, 3, 3, 0, 2, no_landmarks)
+        
+        path = []
+        index = 2
+        while index != -1:
+            path.append((index % 3, index // 3))
+            index = int(came_from[index])
+        path.reverse()
+        self.assertEqual(path, self.pathfinder.find_path((0, 0), (2, 0)))
+        self.assertEqual(trace_path(came_from, 2).tolist(), [y * 3 + x for x, y in path])
+        
+        # Goal behind a closed wall is never reached
+        came_from = astar_grid(np.array([1, 0, 1], dtype=np.uint8), 3, 1, 0, 2, no_landmarks)
+        self.assertEqual(came_from[2], -1)
+
+    def test_landmarks_keep_paths_shortest(self):
+        """Test the ALT heuristic finds equally short paths, with or without numba."""
+        # Two walls forcing a zig-zag
+        collision_map = np.zeros((6, 6), dtype=int)
+        collision_map[1, :5] = 1
+        collision_map[4, 1:] = 1
+        plain = GridPathFinder(collision_map)
+        guided = GridPathFinder(collision_map)
+        guided.precompute_landmarks(count=3)
+        self.assertEqual(guided._landmark_dist.shape, (3, 36))
+        
+        path = guided.find_path((0, 0), (0, 5))
+        self.assertEqual(len(path), len(plain.find_path((0, 0), (0, 5))))
+        
+        came_from = astar_grid((collision_map == 0).ravel().astype(np.uint8), 6, 6, 0, 30,
+                               guided._landmark_dist)
+        index, kernel_path = 30, []
+        while index != -1:
+            kernel_path.append((index % 6, index // 6))
+            index = int(came_from[index])
+        self.assertEqual(kernel_path[::-1], path)
+
+    def test_find_path_same_cell(self):
+        """Test finding path when start equals goal."""
+        self.assertEqual(self.pathfinder.find_path((0, 0), (0, 0)), [(0, 0)])
+
+    def test_find_path_blocked(self):
+        """Test no path into a wall, off the grid, or through a closed wall."""
+        self.assertIsNone(self.pathfinder.find_path((0, 0), (1, 0)))
+        self.assertIsNone(self.pathfinder.find_path((0, 0), (5, 0)))
+        
+        sealed = GridPathFinder(np.array([[0, 1, 0]]))
+        self.assertIsNone(sealed.find_path((0, 0), (2, 0)))
+
+    def test_path_cache_persists_per_map(self):
+        """Test saved paths reload only for a map with the same layout."""
+        path = self.pathfinder.find_path((0, 0), (2, 0))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_path = str(Path(tmp_dir) / "paths.json")
+            self.assertTrue(self.pathfinder.save_cache(cache_path))
+            
+            same_map = GridPathFinder(self.collision_map.copy())
+            self.assertTrue(same_map.load_cache(cache_path))
+            self.assertEqual(same_map._path_cache[(0, 0, 2, 0)], path)
+            
+            other_map = GridPathFinder(np.zeros((3, 3), dtype=int))
+            self.assertTrue(other_map.load_cache(cache_path))
+            self.assertEqual(len(other_map._path_cache), 0)
+
+class TestMapRegistry(unittest.TestCase):
+    def test_registries_are_independent(self):
+        """Test locations are shared only through the same registry."""
+        shared = MapRegistry()
+        other = MapRegistry()
+        loc = MapLocation("A", 0, 0, "map1")
+        shared.add(loc)
+        shared.add(MapLocation("A", 0, 0, "map1"))
+        
+        self.assertEqual(shared.known_locations["map1"], [loc])
+        self.assertEqual(shared.location_names("map1"), {"A"})
+        self.assertEqual(other.known_locations, {})
+        self.assertEqual(other.location_names("map1"), set())
+        
+        shared.clear()
+        self.assertEqual(shared.known_locations, {})
+        self.assertEqual(shared.location_names("map1"), set())
+
+    def test_agents_share_registry(self):
+        """Test agents built on one registry see each other's locations."""
+        registry = MapRegistry()
+        first = NavigationAgent("first", Mock(), map_registry=registry)
+        second = NavigationAgent("second", Mock(), map_registry=registry)
+        loner = NavigationAgent("loner", Mock())
+        
+        route = MapLocation("Route 1", 0, 0, "route1", ["Pallet Town"])
+        town = MapLocation("Pallet Town", 5, 5, "pallet")
+        first.set_current_location(town)
+        second.set_current_location(route)
+        loner.set_current_location(route)
+        
+        self.assertIs(second.known_locations, first.known_locations)
+        self.assertTrue(second.is_reachable(town))
+        self.assertFalse(loner.is_reachable(town))
+        
+        first.clear_map_data()
+        self.assertFalse(second.is_reachable(town))
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
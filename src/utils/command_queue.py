@@ -9,6 +9,11 @@ from utils.logger import get_logger
 
 logger = get_logger("pokemon_player")
 
+# Command types. Commands built by CommandQueue share these string objects,
+# so comparisons against them succeed on identity.
+BUTTON_PRESS = "button_press"
+WAIT = "wait"
+
 @dataclass
 class GameCommand:
     """Represents a single game command"""
@@ -48,15 +53,15 @@ class CommandQueue:
                     time.sleep(command.delay)
                 
                 # Execute command based on type
-                if command.command_type == 'button_press':
+                if command.command_type == BUTTON_PRESS:
                     button = command.args.get('button')
                     duration = command.args.get('duration', 0.1)
-                    logger.debug(f"Executing button press: {button} for {duration}s")
+                    logger.debug("Executing button press: %s for %ss", button, duration)
                     emulator.press_button(button, duration=duration)
                     
-                elif command.command_type == 'wait':
+                elif command.command_type == WAIT:
                     duration = command.args.get('duration', 1.0)
-                    logger.debug(f"Waiting for {duration}s")
+                    logger.debug("Waiting for %ss", duration)
                     time.sleep(duration)
                     
                 else:
@@ -69,7 +74,7 @@ class CommandQueue:
     def create_button_press(button: str, duration: float = 0.1, delay: float = 0.0) -> GameCommand:
         """Create a button press command"""
         return GameCommand(
-            command_type='button_press',
+            command_type=BUTTON_PRESS,
             args={'button': button, 'duration': duration},
             delay=delay
         )
@@ -78,7 +83,21 @@ class CommandQueue:
     def create_wait(duration: float, delay: float = 0.0) -> GameCommand:
         """Create a wait command"""
         return GameCommand(
-            command_type='wait',
+            command_type=WAIT,
             args={'duration': duration},
             delay=delay
-        ) 
\ No newline at end of file
+        )
+        
+    @staticmethod
+    def from_dicts(cmds: List[Dict]) -> List[GameCommand]:
+        """Create commands from parsed LLM command dicts, skipping unknown types"""
+        builders = _COMMAND_BUILDERS
+        return [builders[cmd["type"]](cmd) for cmd in cmds if cmd["type"] in builders]
+
+# Command type -> builder from a parsed LLM command dict
+_COMMAND_BUILDERS = {
+    BUTTON_PRESS: lambda cmd: CommandQueue.create_button_press(
+        cmd["button"], cmd.get("duration", 0.1), cmd.get("delay", 0.0)
+    ),
+    WAIT: lambda cmd: CommandQueue.create_wait(cmd["duration"], cmd.get("delay", 0.0))
+}
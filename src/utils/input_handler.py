@@ -5,35 +5,37 @@ Input handler for emulator controls
 import time
 import platform
 import subprocess
+import threading
 from typing import Dict, Optional
 from utils.logger import get_logger
+from emulator.keysend import KeyBackend, create_backend
 
 # Get logger for this module
 logger = get_logger("pokemon_player")
 
-# Import Quartz on macOS
-if platform.system() == "Darwin":
-    from Quartz import (
-        CGEventCreateKeyboardEvent,
-        CGEventPostToPid,
-        CGEventSetFlags,
-        kCGHIDEventTap,
-        kCGEventFlagMaskCommand
-    )
+# Shortest hold the emulator reliably registers (one frame at 60 FPS)
+FRAME_DURATION = 1 / 60
 
-# Virtual key codes for macOS
-VK_MAP = {
-    'up': 126,    # Up arrow
-    'down': 125,  # Down arrow
-    'left': 123,  # Left arrow
-    'right': 124, # Right arrow
-    'x': 7,       # X key (for A button)
-    'z': 6,       # Z key (for B button)
-    'a': 0,       # A key (for L button)
-    's': 1,       # S key (for R button)
-    'enter': 36,  # Enter/Return (for Start)
-    'backspace': 51, # Delete/Backspace (for Select)
-}
+# Waits shorter than this spin instead of sleeping, since the scheduler
+# can overshoot a short sleep by more than the wait itself
+SPIN_THRESHOLD = 0.005
+
+def precise_sleep(duration: float) -> None:
+    """Wait for duration seconds, spinning for very short waits.
+    
+    Args:
+        duration: Time to wait in seconds
+    """
+    if duration <= 0:
+        return
+        
+    if duration >= SPIN_THRESHOLD:
+        time.sleep(duration)
+        return
+        
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        pass
 
 class InputHandler:
     """Handles keyboard input for the emulator"""
@@ -43,6 +45,17 @@ class InputHandler:
         self.emulator_pid = None
         self.focused = False
         
+        # Pick the platform backend and resolve key codes once up front
+        self.backend: Optional[KeyBackend] = None
+        self.key_codes: Dict[str, int] = {}
+        try:
+            self.backend = create_backend()
+            self.key_codes = self.backend.resolve_keys()
+            # Accept upper-case key names without a str.lower() per press
+            self.key_codes.update({name.upper(): code for name, code in self.key_codes.items()})
+        except Exception as e:
+            logger.error(f"Could not initialize keyboard backend: {e}")
+        
     def get_mgba_pid(self) -> Optional[int]:
         """Get the process ID of mGBA"""
         if platform.system() == "Darwin":
@@ -56,76 +69,115 @@ class InputHandler:
                 return None
         return None
         
+    def _ensure_target(self) -> bool:
+        """Make sure key events have somewhere to go.
+        
+        Returns:
+            True if the backend is ready to send key events
+        """
+        if not self.backend:
+            logger.error("No keyboard backend available")
+            return False
+            
+        if self.backend.requires_pid and not self.emulator_pid:
+            self.emulator_pid = self.get_mgba_pid()
+            if not self.emulator_pid:
+                logger.error("Could not find mGBA process")
+                return False
+                
+        self.backend.pid = self.emulator_pid
+        return True
+        
     def send_key_event(self, key_code: int, key_down: bool):
-        """Send a key event to the mGBA process using Quartz"""
-        if not self.emulator_pid:
+        """Send a key event to the emulator using the platform backend"""
+        if not self.backend:
             return
             
         try:
-            event = CGEventCreateKeyboardEvent(None, key_code, key_down)
-            CGEventPostToPid(self.emulator_pid, event)
-            time.sleep(0.01)  # Small delay between key events
+            if key_down:
+                self.backend.key_down(key_code)
+            else:
+                self.backend.key_up(key_code)
         except Exception as e:
             logger.error(f"Error sending key event: {e}")
+            
+    def send_key_events(self, key_codes: list, key_down: bool):
+        """Send a batch of key events to the emulator in one backend call"""
+        if not self.backend:
+            return
+            
+        try:
+            if key_down:
+                self.backend.keys_down(key_codes)
+            else:
+                self.backend.keys_up(key_codes)
+        except Exception as e:
+            logger.error(f"Error sending key events: {e}")
         
-    def press_button(self, button: str, duration: float = 0.1):
+    def press_button(self, button: str, duration: float = FRAME_DURATION, settle: float = 0.0,
+                     blocking: bool = True):
         """Press a button for the specified duration.
         
         Args:
             button: Button to press ('up', 'down', 'left', 'right', 'a', 'b', 'l', 'r', 'start', 'select')
             duration: How long to hold the button in seconds
+            settle: Optional pause after release, for slow menus
+            blocking: If False, return right after the key down and release
+                the key from a timer thread once duration has elapsed
         """
         try:
-            # Ensure we have the emulator PID
-            if not self.emulator_pid:
-                self.emulator_pid = self.get_mgba_pid()
-                if not self.emulator_pid:
-                    logger.error("Could not find mGBA process")
-                    return
+            # Ensure the backend can reach the emulator
+            if not self._ensure_target():
+                return
                     
             # Get the virtual key code
-            key = VK_MAP.get(button.lower())
-            if not key:
+            key = self.key_codes.get(button)
+            if key is None:
                 logger.error(f"Unknown button: {button}")
                 return
                 
-            logger.debug(f"Pressing {button} (key code {key}) for {duration}s")
+            logger.debug("Pressing %s (key code %s) for %ss", button, key, duration)
             
             # Press and hold the key
             self.send_key_event(key, True)
-            time.sleep(duration)
+            if not blocking and duration >= FRAME_DURATION:
+                threading.Timer(duration, self.send_key_event, (key, False)).start()
+                return
+                
+            precise_sleep(duration)
             self.send_key_event(key, False)
             
+            if settle > 0:
+                time.sleep(settle)
+            
         except Exception as e:
             logger.error(f"Error pressing button {button}: {e}")
             # Make sure to release the key
             try:
-                if key:
+                if key is not None:
                     self.send_key_event(key, False)
             except:
                 pass
             raise
             
-    def press_buttons(self, buttons: list, duration: float = 0.1):
+    def press_buttons(self, buttons: list, duration: float = FRAME_DURATION, settle: float = 0.0):
         """Press multiple buttons simultaneously.
         
         Args:
             buttons: List of buttons to press
             duration: How long to hold the buttons in seconds
+            settle: Optional pause after release, for slow menus
         """
         try:
-            # Ensure we have the emulator PID
-            if not self.emulator_pid:
-                self.emulator_pid = self.get_mgba_pid()
-                if not self.emulator_pid:
-                    logger.error("Could not find mGBA process")
-                    return
+            # Ensure the backend can reach the emulator
+            if not self._ensure_target():
+                return
                     
             # Get virtual key codes
             keys = []
             for button in buttons:
-                key = VK_MAP.get(button.lower())
-                if key:
+                key = self.key_codes.get(button)
+                if key is not None:
                     keys.append(key)
                 else:
                     logger.error(f"Unknown button: {button}")
@@ -133,17 +185,18 @@ class InputHandler:
             if not keys:
                 return
                 
-            logger.debug(f"Pressing {buttons} (key codes {keys}) for {duration}s")
+            logger.debug("Pressing %s (key codes %s) for %ss", buttons, keys, duration)
             
-            # Press all keys
-            for key in keys:
-                self.send_key_event(key, True)
+            # Press all keys at once
+            self.send_key_events(keys, True)
                 
-            time.sleep(duration)
+            precise_sleep(duration)
             
-            # Release all keys
-            for key in reversed(keys):
-                self.send_key_event(key, False)
+            # Release all keys at once
+            self.send_key_events(keys, False)
+                
+            if settle > 0:
+                time.sleep(settle)
                 
         except Exception as e:
             logger.error(f"Error pressing buttons {buttons}: {e}")
@@ -191,14 +244,35 @@ class InputHandler:
             logger.warning(f"Could not focus window: {e}")
             return False
     
-    def press_sequence(self, sequence: list[tuple[str, float]]) -> None:
+    def press_sequence(self, sequence: list[tuple[str, float]], delay: float = FRAME_DURATION) -> None:
         """Press a sequence of buttons with specified durations.
         
+        Key codes are resolved and the emulator target checked once for
+        the whole sequence rather than once per press.
+        
         Args:
             sequence: List of (button, duration) tuples
+            delay: Gap between presses so the emulator sees each release
         """
+        if not self._ensure_target():
+            return
+            
+        keys = []
         for button, duration in sequence:
-            self.press_button(button, duration)
+            key = self.key_codes.get(button)
+            if key is None:
+                logger.error(f"Unknown button: {button}")
+                return
+            keys.append((key, duration))
+            
+        logger.debug("Pressing sequence %s", sequence)
+        
+        for i, (key, duration) in enumerate(keys):
+            if i and delay > 0:
+                time.sleep(delay)
+            self.send_key_event(key, True)
+            precise_sleep(duration)
+            self.send_key_event(key, False)
     
     def hold_direction(self, direction: str, duration: float) -> None:
         """Hold a direction for a specified duration.
@@ -5,7 +5,9 @@ This module provides a unified interface for interacting with various LLM provid
 """
 
 import os
+import asyncio
 import base64
+import functools
 from typing import Optional, Dict, Any, Tuple
 from pathlib import Path
 import requests
@@ -16,6 +18,15 @@ import numpy as np
 
 from utils.logger import get_logger
 
+# orjson parses and serializes several times faster when it is installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Decodes one JSON value from a position, stopping where it ends
+_raw_decoder = json.JSONDecoder()
+
 # Load environment variables
 load_dotenv()
 
@@ -65,6 +76,62 @@ def encode_image(image: np.ndarray) -> str:
     # Convert to base64
     return base64.b64encode(buffer).decode("utf-8")
 
+def extract_json(response: str) -> Dict[str, Any]:
+    """Parse the JSON object embedded in an LLM response.
+    
+    Args:
+        response: LLM response text, possibly with prose around the object
+        
+    Returns:
+        Parsed JSON object
+    """
+    # Decode in place from the first '{'; the decoder stops at the end of the
+    # object, so trailing text is never scanned. If prose braces come first,
+    # move on to the next '{'.
+    start = response.find('{')
+    while start >= 0:
+        try:
+            data, _ = _raw_decoder.raw_decode(response, start)
+            if isinstance(data, dict):
+                return data
+        except json.JSONDecodeError:
+            pass
+        start = response.find('{', start + 1)
+    raise ValueError("No JSON object found in response")
+
+def to_json(obj: Any, sort_keys: bool = False) -> str:
+    """Serialize state for a prompt.
+    
+    Args:
+        obj: JSON-like object; other values are written with str()
+        sort_keys: Sort object keys so equal objects serialize identically
+        
+    Returns:
+        JSON text
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=str, option=option).decode()
+    return json.dumps(obj, default=str, sort_keys=sort_keys)
+
+def from_json(text: str) -> Any:
+    """Parse JSON text, such as an LLM response.
+    
+    Args:
+        text: JSON text
+        
+    Returns:
+        Parsed value
+        
+    Raises:
+        ValueError: If the text is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
 class LLMProvider:
     """Base class for LLM providers."""
     
@@ -84,6 +151,24 @@ class LLMProvider:
             LLM response text
         """
         raise NotImplementedError
+    
+    async def aquery(self, prompt: str, image_path: Optional[str] = None) -> str:
+        """Query the LLM without blocking the event loop.
+        
+        The blocking HTTP request runs on the loop's default executor, so
+        several agents can wait on the API at once.
+        
+        Args:
+            prompt: The prompt to send to the LLM
+            image_path: Optional path to an image file
+            
+        Returns:
+            LLM response text
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(self.query, prompt, image_path=image_path)
+        )
 
 class OpenAIProvider(LLMProvider):
     """OpenAI API provider."""
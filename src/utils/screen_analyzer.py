@@ -4,8 +4,6 @@ Screen analyzer for Pokemon game state detection
 
 import cv2
 import numpy as np
-import pyautogui
-from PIL import Image
 import platform
 import subprocess
 import tempfile
@@ -109,7 +107,8 @@ class ScreenAnalyzer:
                 subprocess.run(['screencapture', '-w', temp_path], check=True)
                 
             else:
-                # For other platforms, use pyautogui
+                # For other platforms, use pyautogui (imported on first use)
+                import pyautogui
                 screenshot = pyautogui.screenshot()
                 screenshot.save(temp_path)
                 
@@ -123,7 +122,7 @@ class ScreenAnalyzer:
             
             # Get image dimensions
             height, width = img.shape[:2]
-            logger.debug(f"Screenshot dimensions: {width}x{height}")
+            logger.debug("Screenshot dimensions: %sx%s", width, height)
             
             # Calculate center crop coordinates
             target_ratio = self.expected_width / self.expected_height
@@ -150,7 +149,7 @@ class ScreenAnalyzer:
             # Resize to expected dimensions
             resized = cv2.resize(cropped, (self.expected_width, self.expected_height))
             
-            logger.debug(f"Processed image to {self.expected_width}x{self.expected_height}")
+            logger.debug("Processed image to %sx%s", self.expected_width, self.expected_height)
             return resized
             
         except Exception as e:
@@ -3,18 +3,135 @@ Screenshot utilities for capturing game state
 """
 
 import cv2
+import mss
 import numpy as np
-import pyautogui
-from PIL import Image
 import platform
 import subprocess
 import tempfile
 import os
 import time
+from typing import Tuple
 from utils.logger import get_logger
 
 logger = get_logger("pokemon_player")
 
+def get_window_bounds(pid: int) -> Tuple[int, int, int, int]:
+    """Get the on-screen bounds of a process's main window (macOS only).
+    
+    Args:
+        pid: Process ID of window owner
+        
+    Returns:
+        Tuple of (x, y, width, height) in screen coordinates
+    """
+    # Focus window and read its bounds using AppleScript with error handling
+    script = """
+    tell application "System Events"
+        try
+            # Get all processes
+            set allProcesses to every process whose unix id is %d
+        
+            # If process found, focus its window
+            if (count of allProcesses) > 0 then
+                set mgbaProcess to item 1 of allProcesses
+                set frontmost of mgbaProcess to true
+                delay 0.5
+            
+                # Get all windows
+                set allWindows to every window of mgbaProcess
+            
+                # If window found, get its properties
+                if (count of allWindows) > 0 then
+                    set mgbaWindow to item 1 of allWindows
+                
+                    # Get window properties
+                    set windowBounds to get size of mgbaWindow
+                    set windowPosition to get position of mgbaWindow
+                
+                    # Log window info for debugging
+                    log "Window Title: " & name of mgbaWindow
+                    log "Position: " & (item 1 of windowPosition as string) & ", " & (item 2 of windowPosition as string)
+                    log "Size: " & (item 1 of windowBounds as string) & ", " & (item 2 of windowBounds as string)
+                
+                    return {item 1 of windowPosition, item 2 of windowPosition, item 1 of windowBounds, item 2 of windowBounds}
+                else
+                    error "No windows found for process"
+                end if
+            else
+                error "Process not found"
+            end if
+        on error errMsg
+            return "error:" & errMsg
+        end try
+    end tell
+    """ % pid
+
+    return _run_bounds_script(script)
+
+def query_window_bounds(pid: int) -> Tuple[int, int, int, int]:
+    """Read the bounds of a process's main window without focusing it (macOS only).
+    
+    Unlike get_window_bounds this neither raises the window nor waits for
+    it to settle, so it is cheap enough to poll.
+    
+    Args:
+        pid: Process ID of window owner
+        
+    Returns:
+        Tuple of (x, y, width, height) in screen coordinates
+    """
+    script = """
+    tell application "System Events"
+        try
+            set allProcesses to every process whose unix id is %d
+            if (count of allProcesses) = 0 then error "Process not found"
+            
+            set allWindows to every window of item 1 of allProcesses
+            if (count of allWindows) = 0 then error "No windows found for process"
+            
+            set mgbaWindow to item 1 of allWindows
+            set windowBounds to get size of mgbaWindow
+            set windowPosition to get position of mgbaWindow
+            return {item 1 of windowPosition, item 2 of windowPosition, item 1 of windowBounds, item 2 of windowBounds}
+        on error errMsg
+            return "error:" & errMsg
+        end try
+    end tell
+    """ % pid
+    
+    return _run_bounds_script(script)
+
+def _run_bounds_script(script: str) -> Tuple[int, int, int, int]:
+    """Run a window bounds AppleScript and parse its result.
+    
+    Args:
+        script: AppleScript returning the bounds or "error:<message>"
+        
+    Returns:
+        Tuple of (x, y, width, height) in screen coordinates
+    """
+    result = subprocess.check_output(['osascript', '-e', script]).decode().strip()
+
+    if result.startswith("error:"):
+        raise Exception(f"AppleScript error: {result[6:]}")
+
+    # Parse the last line which contains the coordinates
+    lines = result.splitlines()
+    coords = lines[-1]
+    x, y, width, height = map(int, coords.split(', '))
+
+    return x, y, width, height
+
+def grab_screen() -> np.ndarray:
+    """Grab the primary monitor directly into an array.
+    
+    Returns:
+        Numpy array (BGR) containing the screenshot
+    """
+    with mss.mss() as sct:
+        shot = sct.grab(sct.monitors[1])
+    return cv2.cvtColor(np.asarray(shot), cv2.COLOR_BGRA2BGR)
+
 def capture_window(pid: int = None, max_retries: int = 3) -> np.ndarray:
     """Capture screenshot of a specific window.
     
@@ -28,78 +145,25 @@ def capture_window(pid: int = None, max_retries: int = 3) -> np.ndarray:
     last_error = None
     for attempt in range(max_retries):
         try:
+            # Without window capture, grab the screen in memory (no PNG round trip)
+            if platform.system() != "Darwin":
+                return grab_screen()
+                
             # Create temp file for screenshot
             with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
                 temp_path = tmp.name
                 
-            if platform.system() == "Darwin":
-                if pid:
-                    # Focus window using AppleScript with error handling
-                    script = """
-                    tell application "System Events"
-                        try
-                            # Get all processes
-                            set allProcesses to every process whose unix id is %d
-                            
-                            # If process found, focus its window
-                            if (count of allProcesses) > 0 then
-                                set mgbaProcess to item 1 of allProcesses
-                                set frontmost of mgbaProcess to true
-                                delay 0.5
-                                
-                                # Get all windows
-                                set allWindows to every window of mgbaProcess
-                                
-                                # If window found, get its properties
-                                if (count of allWindows) > 0 then
-                                    set mgbaWindow to item 1 of allWindows
-                                    
-                                    # Get window properties
-                                    set windowBounds to get size of mgbaWindow
-                                    set windowPosition to get position of mgbaWindow
-                                    
-                                    # Log window info for debugging
-                                    log "Window Title: " & name of mgbaWindow
-                                    log "Position: " & (item 1 of windowPosition as string) & ", " & (item 2 of windowPosition as string)
-                                    log "Size: " & (item 1 of windowBounds as string) & ", " & (item 2 of windowBounds as string)
-                                    
-                                    return {item 1 of windowPosition, item 2 of windowPosition, item 1 of windowBounds, item 2 of windowBounds}
-                                else
-                                    error "No windows found for process"
-                                end if
-                            else
-                                error "Process not found"
-                            end if
-                        on error errMsg
-                            return "error:" & errMsg
-                        end try
-                    end tell
-                    """ % pid
-                    
-                    # Get window bounds
-                    result = subprocess.check_output(['osascript', '-e', script]).decode().strip()
-                    
-                    if result.startswith("error:"):
-                        raise Exception(f"AppleScript error: {result[6:]}")
-                    
-                    # Parse the last line which contains the coordinates
-                    lines = result.splitlines()
-                    coords = lines[-1]
-                    x, y, width, height = map(int, coords.split(', '))
-                    
-                    logger.info(f"Capturing window at x={x}, y={y}, width={width}, height={height}")
-                    
-                    # Take screenshot of the specific region
-                    subprocess.run(['screencapture', '-R%d,%d,%d,%d' % (x, y, width, height), temp_path], check=True)
-                else:
-                    # Take screenshot of focused window
-                    subprocess.run(['screencapture', '-w', temp_path], check=True)
+            if pid:
+                x, y, width, height = get_window_bounds(pid)
                 
-            else:
-                # For other platforms, use pyautogui
-                screenshot = pyautogui.screenshot()
-                screenshot.save(temp_path)
+                logger.info(f"Capturing window at x={x}, y={y}, width={width}, height={height}")
                 
+                # Take screenshot of the specific region
+                subprocess.run(['screencapture', '-R%d,%d,%d,%d' % (x, y, width, height), temp_path], check=True)
+            else:
+                # Take screenshot of focused window
+                subprocess.run(['screencapture', '-w', temp_path], check=True)
+            
             # Read and process the image
             img = cv2.imread(temp_path)
             if img is None:
@@ -132,7 +196,7 @@ def crop_to_ratio(img: np.ndarray, target_width: int, target_height: int) -> np.
     try:
         # Get image dimensions
         height, width = img.shape[:2]
-        logger.debug(f"Input dimensions: {width}x{height}")
+        logger.debug("Input dimensions: %sx%s", width, height)
         
         # Calculate target ratio
         target_ratio = target_width / target_height
@@ -159,7 +223,7 @@ def crop_to_ratio(img: np.ndarray, target_width: int, target_height: int) -> np.
         # Resize to target dimensions
         resized = cv2.resize(cropped, (target_width, target_height))
         
-        logger.debug(f"Output dimensions: {target_width}x{target_height}")
+        logger.debug("Output dimensions: %sx%s", target_width, target_height)
         return resized
         
     except Exception as e:
@@ -181,16 +245,16 @@ def take_screenshot(output_dir="screenshots"):
         # Create output directory if it doesn't exist
         os.makedirs(output_dir, exist_ok=True)
         
-        # Take screenshot using pyautogui with retry
+        # Take screenshot with retry
         for attempt in range(3):
             try:
                 # Take screenshot of the entire screen
-                screenshot = pyautogui.screenshot()
+                screenshot = grab_screen()
                 
                 # Save screenshot with timestamp
                 timestamp = time.strftime("%Y%m%d-%H%M%S")
                 output_path = os.path.join(output_dir, f"screenshot_{timestamp}.png")
-                screenshot.save(output_path)
+                cv2.imwrite(output_path, screenshot)
                 
                 logger.info(f"Screenshot saved to {output_path}")
                 return output_path
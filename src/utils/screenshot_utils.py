@@ -8,7 +8,6 @@ import os
 import time
 import cv2
 import numpy as np
-import pyautogui
 import platform
 from pathlib import Path
 from typing import Optional, Dict, Any
@@ -41,7 +40,8 @@ def take_screenshot_sync(window_title=None, output_path=None, width=None, height
             timestamp = int(time.time() * 1000)  # Use milliseconds for uniqueness
             output_path = str(screenshots_dir / f"screenshot_{timestamp}.png")
             
-        # Take screenshot
+        # Take screenshot (pyautogui is loaded on first use)
+        import pyautogui
         screenshot = pyautogui.screenshot()
         screenshot.save(output_path)
         logger.info(f"Screenshot saved to {output_path}")
@@ -82,7 +82,7 @@ class WebhookHandler:
                         'image/png'
                     )
                 }
-                logger.debug(f"Sending request to {self.webhook_url}")
+                logger.debug("Sending request to %s", self.webhook_url)
                 response = requests.post(
                     self.webhook_url,
                     files=files,
@@ -100,7 +100,7 @@ class WebhookHandler:
             # Parse response
             try:
                 data = response.json()
-                logger.debug(f"Webhook response: {data}")
+                logger.debug("Webhook response: %s", data)
             except json.JSONDecodeError:
                 logger.error(f"Invalid JSON response: {response.text}")
                 return None
@@ -0,0 +1,118 @@
+"""
+Tests for the Agent Manager
+
+This module contains tests for the AgentManager class.
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import Mock
+
+# Adjust sys.path to import our module
+sys.path.insert(0, os.path.abspath('src'))
+
+from ai.agent import Agent
+from ai.agent_manager import AgentManager
+from emulator.interface import EmulatorInterface
+from emulator.game_state import GameState, GameMode, BattleState
+
+class FakeAgent(Agent):
+    """Agent that returns a fixed action, optionally after a delay."""
+    
+    def __init__(self, name: str, action=None, release: threading.Event = None):
+        """Initialize fake agent.
+        
+        Args:
+            name: Agent name
+            action: Action analyze_state returns
+            release: Optional event analyze_state waits on before returning
+        """
+        super().__init__(name)
+        self.action = action
+        self.release = release
+        self.analyze_calls = 0
+        self.executed = []
+    
+    def analyze_state(self, state):
+        """Return the fixed action."""
+        self.analyze_calls += 1
+        if self.release is not None:
+            self.release.wait(timeout=5)
+        return self.action
+    
+    def execute_action(self, action, state):
+        """Record the action."""
+        self.executed.append(action)
+        return True
+
+class TestAgentManager(unittest.TestCase):
+    """Test cases for AgentManager."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.mock_emulator = Mock(spec=EmulatorInterface)
+        self.manager = AgentManager(emulator=self.mock_emulator, config={"battle_strategy": "defensive"})
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        self.manager.shutdown()
+    
+    def test_update_runs_default_agents(self):
+        """Test the built-in battle and navigation agents act on their modes."""
+        self.assertEqual(self.manager.battle_agent.strategy, "DEFENSIVE")
+        
+        self.assertTrue(self.manager.update(GameState(mode=GameMode.OVERWORLD)))
+        self.mock_emulator.press_button.assert_called_with('right')
+        
+        battle = BattleState(available_moves=[{"name": "Tackle", "power": 40, "type": "NORMAL", "pp": 5}])
+        self.assertTrue(self.manager.update(GameState(mode=GameMode.BATTLE, battle=battle)))
+        self.mock_emulator.press_sequence.assert_called()
+        
+        self.assertFalse(self.manager.update(GameState(mode=GameMode.DIALOG)))
+    
+    def test_highest_priority_action_wins(self):
+        """Test the higher priority agent acts, whatever the registration order."""
+        low = FakeAgent("low", action="low")
+        high = FakeAgent("high", action="high")
+        idle = FakeAgent("idle")
+        self.manager.register_agent(GameMode.MENU, low, priority=10)
+        self.manager.register_agent(GameMode.MENU, idle, priority=90)
+        self.manager.register_agent(GameMode.MENU, high, priority=50)
+        
+        self.assertTrue(self.manager.update(GameState(mode=GameMode.MENU)))
+        self.assertEqual(high.executed, ["high"])
+        self.assertEqual(low.executed, [])
+        self.assertEqual(idle.analyze_calls, 1)
+    
+    def test_slow_agent_times_out_and_sits_out(self):
+        """Test one deadline per tick, and no second analysis while one is running."""
+        self.manager.ANALYZE_TIMEOUT = 0.1
+        release = threading.Event()
+        slow = FakeAgent("slow", action="slow", release=release)
+        fast = FakeAgent("fast", action="fast")
+        self.manager.register_agent(GameMode.MENU, slow, priority=90)
+        self.manager.register_agent(GameMode.MENU, fast, priority=10)
+        
+        try:
+            started = time.perf_counter()
+            self.assertTrue(self.manager.update(GameState(mode=GameMode.MENU)))
+            self.assertLess(time.perf_counter() - started, 1.0)
+            self.assertEqual(fast.executed, ["fast"])
+            
+            self.assertTrue(self.manager.update(GameState(mode=GameMode.MENU)))
+            self.assertEqual(slow.analyze_calls, 1)
+            self.assertEqual(slow.executed, [])
+        finally:
+            release.set()
+        
+        # Once the stale analysis finishes, the agent takes part again
+        self.manager._in_flight[slow].result(timeout=1)
+        self.assertTrue(self.manager.update(GameState(mode=GameMode.MENU)))
+        self.assertEqual(slow.analyze_calls, 2)
+        self.assertEqual(slow.executed, ["slow"])
+
+if __name__ == '__main__':
+    unittest.main()
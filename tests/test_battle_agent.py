@@ -35,43 +35,49 @@ class TestBattleAgent(unittest.TestCase):
         normal_state = GameState(mode=GameMode.OVERWORLD)
         self.assertFalse(self.agent.can_handle(normal_state))
     
-    def test_calculate_move_score(self):
-        """Test move scoring calculation."""
-        # Set up test battle state
-        self.agent.current_battle = {
-            "opponent_pokemon": {"type": ["WATER"]}
-        }
-        
-        # Test super effective move
-        grass_move = {
-            "power": 100,
-            "type": "GRASS",
-            "pp": 10,
-            "category": "PHYSICAL"
-        }
-        grass_score = self.agent._calculate_move_score(grass_move)
+    def _best_move_index(self, moves, own_types=(), opp_types=()):
+        """Run analyze_state on a fresh battle and return the chosen move index."""
+        state = GameState(
+            mode=GameMode.BATTLE,
+            battle=BattleState(
+                player_pokemon={"hp_percent": 100, "type": list(own_types)},
+                opponent_pokemon={"type": list(opp_types)},
+                available_moves=moves
+            )
+        )
+        action = self.agent.analyze_state(state)
+        return None if action is None else action["move_index"]
+    
+    def test_get_best_move(self):
+        """Test move selection weighs type effectiveness, STAB, accuracy and PP."""
+        # Super effective beats not very effective
+        moves = [
+            {"power": 100, "type": "FIRE", "pp": 10},
+            {"power": 100, "type": "GRASS", "pp": 10}
+        ]
+        self.assertEqual(self._best_move_index(moves, opp_types=["WATER"]), 1)
         
-        # Test not very effective move
-        fire_move = {
-            "power": 100,
-            "type": "FIRE",
-            "pp": 10,
-            "category": "PHYSICAL"
-        }
-        fire_score = self.agent._calculate_move_score(fire_move)
+        # Same-type attack bonus breaks a tie in power
+        moves = [
+            {"power": 80, "type": "NORMAL", "pp": 10},
+            {"power": 80, "type": "FIRE", "pp": 10}
+        ]
+        self.assertEqual(self._best_move_index(moves, own_types=["FIRE"], opp_types=["NORMAL"]), 1)
         
-        # Test status move
-        status_move = {
-            "power": 0,
-            "type": "NORMAL",
-            "pp": 10,
-            "category": "STATUS"
-        }
-        status_score = self.agent._calculate_move_score(status_move)
+        # Expected damage counts accuracy
+        moves = [
+            {"power": 100, "type": "NORMAL", "pp": 10, "accuracy": 50},
+            {"power": 80, "type": "NORMAL", "pp": 10, "accuracy": 100}
+        ]
+        self.assertEqual(self._best_move_index(moves), 1)
         
-        # Verify scores
-        self.assertGreater(grass_score, fire_score)  # Super effective should score higher
-        self.assertEqual(status_score, 0)  # Status moves currently score 0
+        # Moves out of PP are never picked
+        moves = [
+            {"power": 150, "type": "NORMAL", "pp": 0},
+            {"power": 40, "type": "NORMAL", "pp": 5}
+        ]
+        self.assertEqual(self._best_move_index(moves), 1)
+        self.assertIsNone(self._best_move_index([{"power": 40, "type": "NORMAL", "pp": 0}]))
     
     def test_battle_sequence(self):
         """Test full battle action sequence."""
@@ -96,7 +102,7 @@ class TestBattleAgent(unittest.TestCase):
         # Test execute_action
         result = self.agent.execute_action(action)
         self.assertTrue(result)
-        self.mock_emulator.press_button.assert_called()
+        self.mock_emulator.press_sequence.assert_called_once_with(("A", "A"))
     
     def test_error_handling(self):
         """Test error handling in battle actions."""
@@ -115,7 +121,7 @@ class TestBattleAgent(unittest.TestCase):
         self.assertIsNone(action)
         
         # Test execute_action with emulator error
-        self.mock_emulator.press_button.side_effect = Exception("Emulator error")
+        self.mock_emulator.press_sequence.side_effect = Exception("Emulator error")
         result = self.agent.execute_action({"action": "move", "move_index": 0})
         self.assertFalse(result)
 
@@ -14,7 +14,8 @@ from unittest.mock import patch, MagicMock
 import sys
 sys.path.insert(0, os.path.abspath('src'))
 
-from automation.game_loop import GameLoop
+from automation.game_loop import GameLoop, filter_actions
+from utils.llm_api import from_json
 from emulator.game_state import GameState, GameMode, BattleState
 
 class TestGameLoop(unittest.TestCase):
@@ -94,8 +95,7 @@ class TestGameLoop(unittest.TestCase):
         # Missing duration field
         mock_query_llm.return_value = '[{"action": "press_button", "button": "a"}]'
         actions = self.loop.process_state(fake_image)
-        self.assertEqual(len(actions), 1)
-        self.assertEqual(actions[0].get('duration', 0.1), 0.1)  # Should use default duration
+        self.assertEqual(actions, [])  # Should ignore action without duration
         
         # Missing button field for press_button action
         mock_query_llm.return_value = '[{"action": "press_button", "duration": 0.1}]'
@@ -190,5 +190,44 @@ class TestGameLoop(unittest.TestCase):
         fake_emulator.send_input.assert_any_call("up", 0.1)
         fake_emulator.send_input.assert_any_call("a", 0.1)
 
+class TestActionParsing(unittest.TestCase):
+    """Test cases for parsing and filtering LLM actions."""
+    
+    def test_from_json_rejects_code(self):
+        """Test model output is parsed as data, never executed."""
+        self.assertEqual(from_json('[{"action": "wait", "duration": 1.0}]'), [{"action": "wait", "duration": 1.0}])
+        with self.assertRaises(ValueError):
+            from_json("[__import__('os').system('echo pwned')]")
+    
+    @patch('automation.game_loop.query_llm')
+    def test_process_state_rejects_injection(self, mock_query_llm):
+        """Test a code injection response yields no actions."""
+        fake_image = np.zeros((100, 100, 3), dtype=np.uint8)
+        with patch('automation.game_loop.EmulatorInterface'):
+            loop = GameLoop("rom.gba")
+        
+        mock_query_llm.return_value = "[__import__('os').system('echo pwned')]"
+        with patch('os.system') as mock_system, patch('automation.game_loop.cv2.imwrite'):
+            self.assertEqual(loop.process_state(fake_image), [])
+        mock_system.assert_not_called()
+    
+    def test_filter_actions(self):
+        """Test unknown buttons, missing durations and bad types are dropped."""
+        valid = [
+            {"action": "press_button", "button": "a", "duration": 0.1},
+            {"action": "wait", "duration": 1.0},
+        ]
+        actions = [
+            valid[0],
+            {"action": "press_button", "button": "x", "duration": 0.1},
+            {"action": "press_button", "button": ["a"], "duration": 0.1},
+            {"action": "wait"},
+            {"action": ["press_button"], "duration": 0.1},
+            {"action": {"type": "wait"}, "duration": 0.1},
+            "press_button",
+            valid[1],
+        ]
+        self.assertEqual(filter_actions(actions), valid)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file